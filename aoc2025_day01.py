@@ -3,22 +3,87 @@ Advent of Code 2025
 Day 01: Secret Entrance
 """
 
-import pytest
-
-
-def parse_input(file_name: str) -> list[int]:
-    dir_sign = {"L": -1, "R": 1}
-
-    def convert_rotation(line: str) -> int:
-        direction = dir_sign[line[0]]
-        distance = int(line[1:])
-        return direction * distance
+from collections.abc import Iterable, Iterator
 
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [convert_rotation(line) for line in data_file.read().splitlines()]
+import numpy as np
+import pytest
 
 
-def day01_part1(data: list[int]) -> int:
+def parse_rotations(data: bytes) -> np.ndarray:
+    """Parse rotation lines in bulk into an int64 array (L negative, R positive),
+    without creating a Python int per line."""
+    chars = np.frombuffer(data, dtype=np.uint8)
+    if not len(chars):
+        return np.zeros(0, dtype=np.int64)
+    # Both \n and \r end a line, so CRLF input leaves empty lines to drop
+    is_end = (chars == ord("\n")) | (chars == ord("\r"))
+    ends = np.flatnonzero(is_end)
+    if not is_end[-1]:
+        ends = np.append(ends, len(chars))
+    starts = np.concatenate(([0], ends[:-1] + 1))
+
+    # Each digit is weighted by 10 ** (digits after it on its line)
+    line_of = np.cumsum(is_end) - is_end
+    digits = np.flatnonzero((chars >= ord("0")) & (chars <= ord("9")))
+    place = ends[line_of[digits]] - digits - 1
+    values = (chars[digits].astype(np.int64) - ord("0")) * 10 ** place.astype(np.int64)
+    distances = np.bincount(line_of[digits], weights=values, minlength=len(starts))
+
+    non_empty = ends > starts
+    starts, distances = starts[non_empty], distances[non_empty]
+    signs = np.where(chars[starts] == ord("L"), -1, 1)
+    return signs * distances.astype(np.int64)
+
+
+def parse_input(file_name: str) -> np.ndarray:
+    with open(file_name, "rb") as data_file:
+        return parse_rotations(data_file.read())
+
+
+def read_rotation_chunks(
+    file_name: str, chunk_size: int = 1 << 24
+) -> Iterator[np.ndarray]:
+    """Stream the rotations as arrays of about chunk_size bytes of input each."""
+    with open(file_name, "rb") as data_file:
+        rest = b""
+        while chunk := data_file.read(chunk_size):
+            lines, _, rest = (rest + chunk).rpartition(b"\n")
+            if lines:
+                yield parse_rotations(lines)
+        if rest.strip():
+            yield parse_rotations(rest)
+
+
+def count_zeros(chunks: Iterable[np.ndarray], dial: int = 50) -> tuple[int, int]:
+    """Count the rotations landing on 0 and the clicks passing 0, carrying the
+    dial between chunks. Returns (part 1 count, part 2 count)."""
+    landings = 0
+    crossings = 0
+    for deltas in chunks:
+        positions = dial + np.cumsum(deltas)
+        before = np.concatenate(([dial], positions[:-1] % 100))
+        landings += int(np.count_nonzero(positions % 100 == 0))
+        crossings += int(
+            np.where(
+                deltas > 0,
+                (before + deltas) // 100,
+                np.where(deltas == 0, 1, ((100 - before) % 100 - deltas) // 100),
+            ).sum()
+        )
+        if len(deltas):
+            dial = int(positions[-1] % 100)
+    return landings, crossings
+
+
+def day01_part1(data: np.ndarray | list[int]) -> int:
+    return count_zeros([np.asarray(data, dtype=np.int64)])[0]
+
+
+def day01_part2(data: np.ndarray | list[int]) -> int:
+    return count_zeros([np.asarray(data, dtype=np.int64)])[1]
+
+
+def day01_part1_loop(data: list[int]) -> int:
     dial = 50
     count = 0
 
@@ -30,7 +95,7 @@ def day01_part1(data: list[int]) -> int:
     return count
 
 
-def day01_part2(data: list[int]) -> int:
+def day01_part2_loop(data: list[int]) -> int:
     dial = 50
     count = 0
 
@@ -50,18 +115,40 @@ def day01_part2(data: list[int]) -> int:
 
 
 @pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data() -> list[int]:
+def fixture_test_data() -> np.ndarray:
     return parse_input("data/day01_test.txt")
 
 
-def test_day01_part1(test_data: list[int]) -> None:
+def test_day01_part1(test_data: np.ndarray) -> None:
     assert day01_part1(test_data) == 3
 
 
-def test_day01_part2(test_data: list[int]) -> None:
+def test_day01_part2(test_data: np.ndarray) -> None:
     assert day01_part2(test_data) == 6
 
 
+def test_day01_chunked_matches_loop(tmp_path) -> None:
+    rng = np.random.default_rng(1)
+    deltas = rng.integers(-999, 1000, size=5000)
+    data = deltas.tolist()
+    chunks = np.array_split(deltas, 7)
+    assert count_zeros(chunks) == (day01_part1_loop(data), day01_part2_loop(data))
+    text = "".join(f"{'L' if d < 0 else 'R'}{abs(d)}\n" for d in data).encode()
+    assert (parse_rotations(text) == deltas).all()
+    assert parse_rotations(text.replace(b"\n", b"\r\n")).tolist() == data
+    assert parse_rotations(b"R5\nL3\n\n").tolist() == [5, -3]
+    assert parse_rotations(b"R5\r\nL10\r\n").tolist() == [5, -10]
+
+    path = tmp_path / "rotations.txt"
+    path.write_bytes(text)
+    chunks = read_rotation_chunks(str(path), chunk_size=1000)
+    assert count_zeros(chunks) == (day01_part1_loop(data), day01_part2_loop(data))
+
+    path.write_bytes(text.replace(b"\n", b"\r\n") + b"\r\n")
+    chunks = read_rotation_chunks(str(path), chunk_size=1000)
+    assert count_zeros(chunks) == (day01_part1_loop(data), day01_part2_loop(data))
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day01.txt")
 
@@ -3,12 +3,16 @@ Advent of Code 2025
 Day 03: Lobby
 """
 
+import random
+from collections import defaultdict
+
+import numpy as np
 import pytest
 
 
-def parse_input(file_name: str) -> list[list[int]]:
-    with open(file_name, "r", encoding="ascii") as data_file:
-        return [list(map(int, line)) for line in data_file.read().splitlines()]
+def parse_input(file_name: str) -> list[bytes]:
+    with open(file_name, "rb") as data_file:
+        return data_file.read().split()
 
 
 def largest_joltage(bank: list[int], turn_on: int) -> int:
@@ -34,27 +38,94 @@ def largest_joltage(bank: list[int], turn_on: int) -> int:
     return result
 
 
-def day03_part1(banks: list[list[int]]) -> int:
-    return sum(largest_joltage(bank, 2) for bank in banks)
+def largest_joltage_stack(bank: bytes, turn_on: int) -> int:
+    """Largest turn_on-digit subsequence of the bank's digits, in O(n) with a
+    monotonic stack: a digit pops smaller ones before it while enough
+    digits remain to fill the result."""
+    drop = len(bank) - turn_on
+    stack = bytearray()
+    for digit in bank:
+        while drop and stack and stack[-1] < digit:
+            stack.pop()
+            drop -= 1
+        stack.append(digit)
+    return int(stack[:turn_on])
+
+
+def largest_joltages(banks: np.ndarray, turn_on: int) -> np.ndarray:
+    """Largest turn_on-digit subsequence for every row of a 2D array of digit
+    bytes. Each output digit is the first maximum of a window that still
+    leaves room for the digits after it, picked for all rows at once.
+    This is O(n * turn_on) per bank, not the O(n) of largest_joltage_stack,
+    but the turn_on passes are vectorised over all rows."""
+    rows, length = banks.shape
+    cols = np.arange(length)
+    start = np.zeros((rows, 1), dtype=np.intp)
+    result = np.zeros(rows, dtype=np.int64)
+    for pos in range(turn_on):
+        window = (cols >= start) & (cols <= length - turn_on + pos)
+        choice = np.argmax(np.where(window, banks, 0), axis=1)
+        result = result * 10 + (banks[np.arange(rows), choice] - ord("0"))
+        start = choice[:, None] + 1
+    return result
+
+
+def total_joltage(banks: list[bytes], turn_on: int, batched: bool = True) -> int:
+    """Sum of the largest joltages, with the batched windowed argmax by
+    default, which beats the per-bank O(n) stack in Python on inputs from
+    a few hundred to thousands of banks, or with the stack if not batched."""
+    if not batched:
+        return sum(largest_joltage_stack(bank, turn_on) for bank in banks)
+    # Banks of equal length are stacked into one 2D array
+    by_length = defaultdict(list)
+    for bank in banks:
+        by_length[len(bank)].append(bank)
+    return sum(
+        int(
+            largest_joltages(
+                np.frombuffer(b"".join(group), dtype=np.uint8).reshape(len(group), -1),
+                turn_on,
+            ).sum()
+        )
+        for group in by_length.values()
+    )
+
+
+def day03_part1(banks: list[bytes]) -> int:
+    return total_joltage(banks, 2)
 
 
-def day03_part2(banks: list[list[int]]) -> int:
-    return sum(largest_joltage(bank, 12) for bank in banks)
+def day03_part2(banks: list[bytes]) -> int:
+    return total_joltage(banks, 12)
 
 
 @pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data() -> list[list[int]]:
+def fixture_test_data() -> list[bytes]:
     return parse_input("data/day03_test.txt")
 
 
-def test_day03_part1(test_data: list[list[int]]) -> None:
+def test_day03_part1(test_data: list[bytes]) -> None:
     assert day03_part1(test_data) == 357
 
 
-def test_day03_part2(test_data: list[list[int]]) -> None:
+def test_day03_part2(test_data: list[bytes]) -> None:
     assert day03_part2(test_data) == 3121910778619
 
 
+def test_joltage_implementations_agree() -> None:
+    rng = random.Random(3)
+    banks = [
+        bytes(rng.choice(b"123456789") for _ in range(rng.choice([12, 15, 40])))
+        for _ in range(200)
+    ]
+    for turn_on in (2, 12):
+        expected = sum(
+            largest_joltage([digit - 48 for digit in bank], turn_on) for bank in banks
+        )
+        assert total_joltage(banks, turn_on, batched=False) == expected
+        assert total_joltage(banks, turn_on) == expected
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day03.txt")
 
@@ -5,13 +5,22 @@ Day 04: Printing Department
 
 from itertools import product
 
+import numpy as np
 import pytest
 
 Position = tuple[int, int]
 Rolls = set[Position]
+Grid = np.ndarray  # uint8, grid[y, x] == 1 where there is a roll
 
 
-def parse_input(file_name: str) -> Rolls:
+def parse_input(file_name: str) -> Grid:
+    with open(file_name, "rb") as data_file:
+        lines = data_file.read().split()
+    cells = np.frombuffer(b"".join(lines), dtype=np.uint8).reshape(len(lines), -1)
+    return (cells == ord("@")).astype(np.uint8)
+
+
+def parse_rolls(file_name: str) -> Rolls:
     with open(file_name, "r", encoding="ascii") as data_file:
         rolls = set(
             (x, y)
@@ -22,6 +31,20 @@ def parse_input(file_name: str) -> Rolls:
         return rolls
 
 
+def to_rolls(grid: Grid) -> Rolls:
+    ys, xs = np.nonzero(grid)
+    return set(zip(xs.tolist(), ys.tolist()))
+
+
+def to_grid(rolls: Rolls) -> Grid:
+    height = max((y for _, y in rolls), default=-1) + 1
+    width = max((x for x, _ in rolls), default=-1) + 1
+    grid = np.zeros((height, width), dtype=np.uint8)
+    for x, y in rolls:
+        grid[y, x] = 1
+    return grid
+
+
 def neighbors(rolls: Rolls, pos: Position):
     for dx, dy in product([-1, 0, 1], repeat=2):
         if (dx, dy) != (0, 0):
@@ -34,40 +57,85 @@ def count_neighbors(rolls: Rolls, pos: Position) -> int:
     return sum(1 for _ in neighbors(rolls, pos))
 
 
-def day04_part1(rolls: Rolls) -> int:
-    return sum(count_neighbors(rolls, roll) < 4 for roll in rolls)
-
-
-def day04_part2(rolls: Rolls) -> int:
-    rolls_neigh_count = {pos: count_neighbors(rolls, pos) for pos in rolls}
+def neighbor_counts(grid: Grid) -> np.ndarray:
+    """Number of rolls among the 8 neighbours of every cell, as the sum of
+    the 8 shifted copies of the zero-padded grid."""
+    height, width = grid.shape
+    padded = np.pad(grid, 1)
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    for dx, dy in product([-1, 0, 1], repeat=2):
+        if (dx, dy) != (0, 0):
+            counts += padded[1 + dy : 1 + dy + height, 1 + dx : 1 + dx + width]
+    return counts
+
+
+def day04_part1(rolls: Grid | Rolls) -> int:
+    if isinstance(rolls, set):
+        return sum(count_neighbors(rolls, roll) < 4 for roll in rolls)
+    return int(np.count_nonzero(rolls & (neighbor_counts(rolls) < 4)))
+
+
+def day04_part2(rolls: Grid | Rolls, trace: list[int] | None = None) -> int:
+    """Peel off rolls with fewer than 4 neighbours until none is left, like a
+    k-core decomposition: each removal decrements its neighbours and only
+    those dropping below 4 are queued, so every roll is handled once.
+    If given, trace receives the number of rolls removed in each round.
+    """
+    grid = to_grid(rolls) if isinstance(rolls, set) else rolls
+    # Work on the flattened zero-padded grid, so neighbours are fixed offsets
+    width = grid.shape[1] + 2
+    offsets = [dy * width + dx for dx, dy in product([-1, 0, 1], repeat=2)]
+    offsets.remove(0)
+    alive = bytearray(np.pad(grid, 1).tobytes())
+    counts = np.pad(neighbor_counts(grid), 1).ravel().tolist()
+
+    queue = np.flatnonzero(np.pad(grid & (neighbor_counts(grid) < 4), 1)).tolist()
     count_removed = 0
-    while True:
-        to_be_removed = []
-        for roll, num_neighbors in rolls_neigh_count.items():
-            if num_neighbors < 4:
-                to_be_removed.append(roll)
-                for neighbor in neighbors(rolls, roll):
-                    rolls_neigh_count[neighbor] -= 1
-        if not to_be_removed:
-            break
-        for roll in to_be_removed:
-            count_removed += 1
-            rolls.remove(roll)
-            rolls_neigh_count.pop(roll)
+    while queue:
+        for pos in queue:
+            alive[pos] = 0
+        if trace is not None:
+            trace.append(len(queue))
+        count_removed += len(queue)
+        next_queue = []
+        for pos in queue:
+            for offset in offsets:
+                other = pos + offset
+                if alive[other]:
+                    counts[other] -= 1
+                    if counts[other] == 3:
+                        alive[other] = 0
+                        next_queue.append(other)
+        queue = next_queue
     return count_removed
 
 
 @pytest.fixture(autouse=True, name="test_data")
-def fixture_test_data() -> Rolls:
+def fixture_test_data() -> Grid:
     return parse_input("data/day04_test.txt")
 
 
-def test_day04_part1(test_data: Rolls) -> None:
+def test_day04_part1(test_data: Grid) -> None:
     assert day04_part1(test_data) == 13
+    assert day04_part1(parse_rolls("data/day04_test.txt")) == 13
 
 
-def test_day04_part2(test_data: Rolls) -> None:
+def test_day04_part2(test_data: Grid) -> None:
     assert day04_part2(test_data) == 43
+    assert day04_part2(parse_rolls("data/day04_test.txt")) == 43
+
+
+def test_day04_part2_trace(test_data: Grid) -> None:
+    trace: list[int] = []
+    assert day04_part2(test_data, trace) == 43
+    assert trace[0] == day04_part1(test_data)
+    assert sum(trace) == 43
+
+
+def test_neighbor_counts(test_data: Grid) -> None:
+    rolls = to_rolls(test_data)
+    counts = neighbor_counts(test_data)
+    assert all(counts[y, x] == count_neighbors(rolls, (x, y)) for x, y in rolls)
 
 
 if __name__ == "__main__":
@@ -3,12 +3,22 @@ Advent of Code 2025
 Day 05: Cafeteria
 """
 
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator
+
+import numpy as np
 import pytest
 
 
 class IdRange:
     """Represents a range with start and end values."""
 
+    __slots__ = ("start", "end")
+
     def __init__(self, start: int, end: int):
         self.start = start
         self.end = end
@@ -45,24 +55,135 @@ def parse_input(file_name: str) -> tuple[list[IdRange], list[int]]:
         return fresh_ranges, available_ingredients
 
 
+class IntervalIndex:
+    """Sorted, merged ranges stored as parallel arrays of starts and ends."""
+
+    def __init__(self, id_ranges: Iterable[IdRange]):
+        self.starts = array("q")
+        self.ends = array("q")
+        for id_range in sorted(id_ranges, key=lambda r: r.start):
+            if self.ends and id_range.start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], id_range.end)
+            else:
+                self.starts.append(id_range.start)
+                self.ends.append(id_range.end)
+
+    def __contains__(self, range_id: int) -> bool:
+        idx = bisect_right(self.starts, range_id) - 1
+        return idx >= 0 and range_id <= self.ends[idx]
+
+    def count_contained(self, range_ids: Iterable[int]) -> int:
+        """Count how many of the ids fall in a range, with one searchsorted."""
+        ids = np.fromiter(range_ids, dtype=np.int64)
+        starts = np.frombuffer(self.starts, dtype=np.int64)
+        ends = np.frombuffer(self.ends, dtype=np.int64)
+        if not len(starts):
+            return 0
+        idx = np.searchsorted(starts, ids, side="right") - 1
+        return int(np.count_nonzero((idx >= 0) & (ids <= ends[idx])))
+
+    def __len__(self) -> int:
+        """Number of ids covered by the ranges."""
+        return sum(end - start + 1 for start, end in zip(self.starts, self.ends))
+
+
+class IntervalSet:
+    """Mutable set of disjoint ranges kept sorted in parallel lists.
+    add_range and remove_range find the affected ranges in O(log n), but
+    splicing the lists shifts their tails, so they are O(n) in the worst
+    case (a memmove, fast in practice). total_fresh, the number of ids
+    covered, is kept up to date in O(1) per update.
+    """
+
+    def __init__(self, id_ranges: Iterable[IdRange] = ()):
+        self.starts: list[int] = []
+        self.ends: list[int] = []
+        self.total_fresh = 0
+        for id_range in id_ranges:
+            self.add_range(id_range.start, id_range.end)
+
+    def add_range(self, start: int, end: int) -> None:
+        # Ranges overlapping or adjacent to [start, end] are merged into it
+        lo = bisect_left(self.ends, start - 1)
+        hi = bisect_right(self.starts, end + 1)
+        if lo < hi:
+            start = min(start, self.starts[lo])
+            end = max(end, self.ends[hi - 1])
+            self.total_fresh -= sum(
+                e - s + 1 for s, e in zip(self.starts[lo:hi], self.ends[lo:hi])
+            )
+        self.starts[lo:hi] = [start]
+        self.ends[lo:hi] = [end]
+        self.total_fresh += end - start + 1
+
+    def remove_range(self, start: int, end: int) -> None:
+        lo = bisect_left(self.ends, start)
+        hi = bisect_right(self.starts, end)
+        if lo == hi:
+            return
+        # Only the first and last overlapping ranges can stick out
+        first_start, last_end = self.starts[lo], self.ends[hi - 1]
+        self.total_fresh -= sum(
+            e - s + 1 for s, e in zip(self.starts[lo:hi], self.ends[lo:hi])
+        )
+        kept = []
+        if first_start < start:
+            kept.append((first_start, start - 1))
+        if last_end > end:
+            kept.append((end + 1, last_end))
+        self.starts[lo:hi] = [s for s, _ in kept]
+        self.ends[lo:hi] = [e for _, e in kept]
+        self.total_fresh += sum(e - s + 1 for s, e in kept)
+
+    def __contains__(self, range_id: int) -> bool:
+        idx = bisect_right(self.starts, range_id) - 1
+        return idx >= 0 and range_id <= self.ends[idx]
+
+
+def read_fresh_ranges(file_name: str) -> Iterator[IdRange]:
+    """Stream the ranges of the first section of the file."""
+    with open(file_name, "r", encoding="ascii") as data_file:
+        for line in data_file:
+            if not line.strip():
+                return
+            yield IdRange(*map(int, line.split("-")))
+
+
+def benchmark_streaming(sizes=(500, 2_000)) -> None:
+    """Compare keeping the part 2 answer current after every new range,
+    incrementally or by re-merging all the ranges from scratch."""
+    rng = random.Random(5)
+    for n in sizes:
+        id_ranges = []
+        for _ in range(n):
+            start = rng.randrange(10**12)
+            id_ranges.append(IdRange(start, start + rng.randrange(10**9)))
+
+        start_time = time.perf_counter()
+        interval_set = IntervalSet()
+        for id_range in id_ranges:
+            interval_set.add_range(id_range.start, id_range.end)
+        incremental = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for i in range(1, n + 1):
+            total = len(IntervalIndex(id_ranges[:i]))
+        from_scratch = time.perf_counter() - start_time
+
+        assert total == interval_set.total_fresh
+        print(
+            f"n={n:>6} incremental: {incremental:8.3f}s  re-merge: {from_scratch:8.3f}s"
+        )
+
+
 def day05_part1(data: tuple[list[IdRange], list[int]]) -> int:
     fresh_ranges, available_ingredients = data
-    return sum(
-        any(id_range.contains_id(ingredient) for id_range in fresh_ranges)
-        for ingredient in available_ingredients
-    )
+    return IntervalIndex(fresh_ranges).count_contained(available_ingredients)
 
 
 def day05_part2(data: tuple[list[IdRange], list[int]]) -> int:
     fresh_ranges, _ = data
-    updated_ranges: list[IdRange] = []
-    for current in sorted(fresh_ranges):
-        if updated_ranges and updated_ranges[-1].overlaps_with(current):
-            updated_ranges[-1].merge_with(current)
-        else:
-            updated_ranges.append(current)
-
-    return sum(len(id_range) for id_range in updated_ranges)
+    return len(IntervalIndex(fresh_ranges))
 
 
 @pytest.fixture(autouse=True, name="test_data")
@@ -78,7 +199,43 @@ def test_day05_part2(test_data):
     assert day05_part2(test_data) == 14
 
 
+def test_interval_index():
+    rng = random.Random(5)
+    id_ranges = []
+    for _ in range(50):
+        start = rng.randrange(1000)
+        id_ranges.append(IdRange(start, start + rng.randrange(30)))
+    index = IntervalIndex(id_ranges)
+    ids = list(range(-5, 1100))
+    expected = [any(r.contains_id(i) for r in id_ranges) for i in ids]
+    assert [i in index for i in ids] == expected
+    assert index.count_contained(ids) == sum(expected)
+    assert len(index) == sum(expected)
+
+
+def test_interval_set():
+    rng = random.Random(20)
+    interval_set = IntervalSet(read_fresh_ranges("data/day05_test.txt"))
+    assert interval_set.total_fresh == 14
+    fresh = {i for i in range(100) if i in interval_set}
+    for _ in range(200):
+        start = rng.randrange(100)
+        end = start + rng.randrange(10)
+        if rng.random() < 0.6:
+            interval_set.add_range(start, end)
+            fresh.update(range(start, end + 1))
+        else:
+            interval_set.remove_range(start, end)
+            fresh.difference_update(range(start, end + 1))
+        assert interval_set.total_fresh == len(fresh)
+        assert {i for i in range(120) if i in interval_set} == fresh
+
+
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_streaming()
+        sys.exit()
+
     input_data = parse_input("data/day05.txt")
 
     print("Day 05 Part 1:")
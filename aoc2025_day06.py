@@ -4,25 +4,107 @@ Day 06: Trash Compactor
 """
 
 # pylint: skip-file
+import random
 from math import prod
 
+import numpy as np
 import pytest
 
 OPS = {"*": prod, "+": sum}
 
+SPACE = ord(" ")
+Worksheet = np.ndarray  # uint8, one row per line padded with spaces, ops last
 
-def parse_input(file_name):
+
+def parse_input(file_name: str) -> Worksheet:
+    with open(file_name, "rb") as data_file:
+        return to_worksheet(data_file.read().splitlines())
+
+
+def read_lines(file_name: str) -> list[str]:
     with open(file_name, "r", encoding="ascii") as data_file:
         return data_file.read().splitlines()
 
 
-def day06_part1(data: list[str]) -> int:
+def to_worksheet(lines: list[bytes] | list[str]) -> Worksheet:
+    lines = [line.encode() if isinstance(line, str) else line for line in lines]
+    sheet = np.full((len(lines), max(map(len, lines))), SPACE, dtype=np.uint8)
+    for row, line in zip(sheet, lines):
+        row[: len(line)] = np.frombuffer(line, dtype=np.uint8)
+    return sheet
+
+
+def problems(sheet: Worksheet) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split the worksheet at its all-blank columns.
+    Returns the worksheet without blank columns, the index of the first
+    column of each problem in it, and whether each problem multiplies.
+    """
+    used = (sheet != SPACE).any(axis=0)
+    first = used & ~np.concatenate(([False], used[:-1]))
+    cells = sheet[:, used]
+    starts = np.flatnonzero(first[used])
+    is_product = np.maximum.reduceat(cells[-1], starts) == ord("*")
+    return cells, starts, is_product
+
+
+def evaluate(
+    values: np.ndarray, present: np.ndarray, starts: np.ndarray, is_product: np.ndarray
+) -> int:
+    """Sum of the problems, given the numbers of each problem in the
+    segments of values that begin at starts. Absent numbers are skipped."""
+    values = values.astype(object)  # products can outgrow int64
+    sums = np.add.reduceat(np.where(present, values, 0), starts)
+    products = np.multiply.reduceat(np.where(present, values, 1), starts)
+    return int(np.where(is_product, products, sums).sum())
+
+
+def day06_part1(sheet: Worksheet | list[str]) -> int:
+    # Each row of a problem is a number. A digit's place value is 10 to the
+    # number of digits after it in the same row and problem.
+    if isinstance(sheet, list):
+        sheet = to_worksheet(sheet)
+    cells, starts, is_product = problems(sheet)
+    is_digit = cells[:-1] != SPACE
+    digits = np.where(is_digit, cells[:-1] - ord("0"), 0).astype(np.int64)
+    segment = np.repeat(np.arange(len(starts)), np.diff(starts, append=len(cells[0])))
+
+    count = np.add.reduceat(is_digit, starts, axis=1)
+    seen = np.cumsum(is_digit, axis=1)
+    before = seen[:, starts] - is_digit[:, starts]
+    after = count[:, segment] - (seen - before[:, segment])
+    values = np.add.reduceat(digits * 10 ** after.astype(np.int64), starts, axis=1)
+    # Lay the numbers out problem by problem, one per digit row
+    rows = len(values)
+    return evaluate(
+        values.T.ravel(),
+        (count > 0).T.ravel(),
+        np.arange(len(starts)) * rows,
+        is_product,
+    )
+
+
+def day06_part2(sheet: Worksheet | list[str]) -> int:
+    # Each column of a problem is a number read top to bottom, so the digit
+    # rows are folded into one value per column
+    if isinstance(sheet, list):
+        sheet = to_worksheet(sheet)
+    cells, starts, is_product = problems(sheet)
+    values = np.zeros(cells.shape[1], dtype=np.int64)
+    present = np.zeros(cells.shape[1], dtype=bool)
+    for row in cells[:-1]:
+        is_digit = row != SPACE
+        values = np.where(is_digit, values * 10 + (row - ord("0")), values)
+        present |= is_digit
+    return evaluate(values, present, starts, is_product)
+
+
+def day06_part1_lines(data: list[str]) -> int:
     columns = zip(*(map(int, line.split()) for line in data[:-1]))
     operations = data[-1].split()
     return sum(OPS[op](map(int, values)) for values, op in zip(columns, operations))
 
 
-def day06_part2(data: list[str]) -> int:
+def day06_part2_lines(data: list[str]) -> int:
     lines = [line.ljust(max(map(len, data))) for line in data]
     columns = (
         "".join(line[i] for line in lines) for i in reversed(range(len(lines[0])))
@@ -41,6 +123,31 @@ def day06_part2(data: list[str]) -> int:
     return sum(process_columns(columns))
 
 
+def random_worksheet(
+    rng: random.Random, num_problems: int, rows: int = 4
+) -> tuple[list[str], int, int]:
+    """Worksheet of numbers of mixed lengths, left or right aligned within
+    each problem, with its part 1 and part 2 answers."""
+    lines: list[list[str]] = [[] for _ in range(rows + 1)]
+    part1 = part2 = 0
+    for _ in range(num_problems):
+        numbers = [
+            str(rng.randrange(1, 10 ** rng.randrange(1, 5))) for _ in range(rows)
+        ]
+        width = max(map(len, numbers))
+        align = rng.choice([str.ljust, str.rjust])
+        cells = [align(number, width) for number in numbers]
+        op = rng.choice("*+")
+        for line, cell in zip(lines, cells):
+            line.append(cell)
+        lines[-1].append(op.ljust(width))
+        # Columns read top to bottom, skipping the alignment spaces
+        columns = ["".join(cell[i] for cell in cells) for i in range(width)]
+        part1 += OPS[op](map(int, numbers))
+        part2 += OPS[op](int(column.replace(" ", "")) for column in columns)
+    return [" ".join(line) for line in lines], part1, part2
+
+
 @pytest.fixture(autouse=True, name="test_data")
 def fixture_test_data():
     return parse_input("data/day06_test.txt")
@@ -48,10 +155,20 @@ def fixture_test_data():
 
 def test_day06_part1(test_data):
     assert day06_part1(test_data) == 4277556
+    assert day06_part1_lines(read_lines("data/day06_test.txt")) == 4277556
 
 
 def test_day06_part2(test_data):
     assert day06_part2(test_data) == 3263827
+    assert day06_part2_lines(read_lines("data/day06_test.txt")) == 3263827
+
+
+def test_worksheet_matches_lines():
+    rng = random.Random(6)
+    for _ in range(50):
+        lines, part1, part2 = random_worksheet(rng, rng.randrange(1, 20))
+        assert day06_part1(lines) == day06_part1_lines(lines) == part1
+        assert day06_part2(lines) == part2
 
 
 if __name__ == "__main__":
@@ -3,31 +3,50 @@ Advent of Code 2025
 Day 07: Laboratories
 """
 
+import random
+import sys
+import time
+from collections.abc import Iterable, Iterator
+
+import numpy as np
 import pytest
 
+# Maps a grid row to a binary string with a 1 for every splitter
+SPLITTER_BITS = str.maketrans(".^S", "010")
+
 
 def parse_input(file_name: str) -> list[str]:
     with open(file_name, "r", encoding="ascii") as data_file:
         return data_file.read().splitlines()
 
 
-def day07_part1(grid: list[str]) -> int:
-    # Beams at time i are represented by their column position j
-    beams = {grid[0].find("S")}
+def read_rows(file_name: str) -> Iterator[str]:
+    """Stream the grid one row at a time."""
+    with open(file_name, "r", encoding="ascii") as data_file:
+        for line in data_file:
+            yield line.rstrip("\n")
+
+
+def splitter_mask(row: str) -> int:
+    """Bitmask of the splitters in a row, bit j for column j."""
+    return int(row.translate(SPLITTER_BITS)[::-1] or "0", 2)
+
+
+def day07_part1(grid: Iterable[str]) -> int:
+    # Beams are a bitmask with bit j set for a beam in column j. Rows are
+    # consumed one at a time, so a streamed grid needs O(width) memory.
+    rows = iter(grid)
+    beams = 1 << next(rows).find("S")
     splits = 0
-    for i in range(len(grid) - 1):
-        new_beams = set()
-        for j in beams:
-            if grid[i + 1][j] == "^":
-                new_beams.update([j - 1, j + 1])
-                splits += 1
-            else:
-                new_beams.add(j)
-        beams = new_beams
+    for row in rows:
+        splitters = splitter_mask(row)
+        hits = beams & splitters
+        splits += hits.bit_count()
+        beams = (beams & ~splitters) | (hits << 1) | (hits >> 1)
     return splits
 
 
-def day07_part2(grid: list[str]) -> int:
+def count_timelines_dict(grid: list[str]) -> int:
     # beam_counts[j] is the number of timelines for a beam
     # in column j at time i
     beam_counts = {grid[0].find("S"): 1}
@@ -44,6 +63,70 @@ def day07_part2(grid: list[str]) -> int:
     return sum(beam_counts.values())
 
 
+# Largest count that can be tripled (straight beam plus both
+# neighbours splitting into it) without overflowing int64
+INT64_SAFE_MAX = np.iinfo(np.int64).max // 3
+
+
+def count_timelines_dense(grid: Iterable[str]) -> int:
+    # counts[j + 1] is the number of timelines for a beam in column j, with
+    # one spare column on each side. Counts stay int64 while they are safe
+    # and move to an array of Python ints once they could overflow.
+    rows = iter(grid)
+    first = next(rows)
+    counts = np.zeros(len(first) + 2, dtype=np.int64)
+    low = high = first.find("S") + 1  # columns the beams can have reached
+    counts[low] = 1
+    for row in rows:
+        cols = np.flatnonzero(np.frombuffer(row.encode(), np.uint8) == ord("^")) + 1
+        cols = cols[np.searchsorted(cols, low) : np.searchsorted(cols, high, "right")]
+        if not len(cols):
+            continue
+        if counts.dtype != object and counts[low : high + 1].max() > INT64_SAFE_MAX:
+            counts = counts.astype(object)
+        # Scatter-add each splitter's beams to its two neighbours
+        hits = counts[cols]
+        counts[cols] = 0
+        np.add.at(counts, cols - 1, hits)
+        np.add.at(counts, cols + 1, hits)
+        low, high = min(low, cols[0] - 1), max(high, cols[-1] + 1)
+
+    return int(counts.sum())
+
+
+def day07_part2(grid: list[str], engine: str = "dense") -> int:
+    if engine == "dict":
+        return count_timelines_dict(grid)
+    return count_timelines_dense(grid)
+
+
+def synthetic_grid(size: int, rng: random.Random) -> list[str]:
+    """Square grid with the start on top and splitters on every other row."""
+    grid = ["." * (size // 2) + "S" + "." * (size - size // 2 - 1)]
+    for i in range(1, size):
+        if i % 2:
+            grid.append("." * size)
+        else:
+            grid.append(
+                "".join("^" if rng.random() < 0.3 else "." for _ in range(size))
+            )
+    return grid
+
+
+def benchmark_part2(sizes=(1_000, 10_000)) -> None:
+    """Compare the dict and dense engines on synthetic grids."""
+    rng = random.Random(7)
+    for size in sizes:
+        grid = synthetic_grid(size, rng)
+        for engine in ("dict", "dense"):
+            start = time.perf_counter()
+            result = day07_part2(grid, engine)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{size}x{size} {engine:>5}: {elapsed:8.3f}s  ({result.bit_length()} bits)"
+            )
+
+
 @pytest.fixture(autouse=True, name="test_data")
 def fixture_test_data():
     return parse_input("data/day07_test.txt")
@@ -53,15 +136,30 @@ def test_day07_part1(test_data):
     assert day07_part1(test_data) == 21
 
 
+def test_day07_part1_streaming():
+    assert day07_part1(read_rows("data/day07_test.txt")) == 21
+
+
 def test_day07_part2(test_data):
     assert day07_part2(test_data) == 40
+    assert day07_part2(test_data, engine="dict") == 40
+
+
+def test_dense_engine_overflow():
+    # Enough splitter rows for counts to outgrow int64
+    grid = synthetic_grid(500, random.Random(16))
+    assert day07_part2(grid) == day07_part2(grid, engine="dict")
 
 
 if __name__ == "__main__":
+    if "--bench" in sys.argv:
+        benchmark_part2()
+        sys.exit()
+
     input_data = parse_input("data/day07.txt")
 
     print("Day 07 Part 1:")
-    print(day07_part1(input_data))
+    print(day07_part1(read_rows("data/day07.txt")))
 
     print("Day 07 Part 2:")
     print(day07_part2(input_data))
@@ -4,10 +4,17 @@ Day 08: Playground
 """
 
 # pylint: skip-file
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
-from itertools import combinations
-from math import prod, sqrt
+from itertools import combinations, islice
+from math import isqrt, prod, sqrt
 
+import numpy as np
 import pytest
 
 
@@ -23,14 +30,92 @@ class Point:
             (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
         )
 
+    def squared_distance(self, other: "Point") -> int:
+        """Calculate the exact squared Euclidean distance to another point."""
+        return (
+            (self.x - other.x) ** 2 + (self.y - other.y) ** 2 + (self.z - other.z) ** 2
+        )
+
 
-def parse_input(file_name: str) -> list[tuple[Point, Point]]:
-    """Parse input file and return sorted pairs."""
+def parse_input(file_name: str) -> list[Point]:
+    """Parse input file and return the list of points."""
     with open(file_name, "r", encoding="ascii") as data_file:
-        points = [
+        return [
             Point(*map(int, line.split(","))) for line in data_file.read().splitlines()
         ]
-    return sorted(combinations(points, 2), key=lambda pair: pair[0].distance(pair[1]))
+
+
+class PointArray:
+    """Columnar point set: one int64 array per coordinate.
+    Indexing returns a Point, so it can stand in for a list of points.
+    """
+
+    def __init__(self, points: Iterable[Point]):
+        coords = np.array([(p.x, p.y, p.z) for p in points], dtype=np.int64)
+        self.x, self.y, self.z = coords.reshape(-1, 3).T.copy()
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, idx: int) -> Point:
+        return Point(int(self.x[idx]), int(self.y[idx]), int(self.z[idx]))
+
+    def pairs_in_shell(
+        self, low: int, high: int, block: int = 64
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (squared distance, i, j) arrays with i < j for the pairs with
+        low < distance² <= high, sorted by (distance², i, j).
+        Points are swept in x order, and each block of rows is only compared
+        with the following points that are within sqrt(high) in x.
+        """
+        order = np.argsort(self.x, kind="stable")
+        xs, ys, zs = self.x[order], self.y[order], self.z[order]
+        reach = isqrt(high) + 1
+        found = []
+        for start in range(0, len(order), block):
+            stop = min(start + block, len(order))
+            end = int(np.searchsorted(xs, xs[stop - 1] + reach, side="right"))
+            d2 = (xs[start:stop, None] - xs[None, start:end]) ** 2
+            d2 += (ys[start:stop, None] - ys[None, start:end]) ** 2
+            d2 += (zs[start:stop, None] - zs[None, start:end]) ** 2
+            rows, cols = np.nonzero((d2 > low) & (d2 <= high))
+            keep = cols > rows  # each pair once, in sweep order
+            rows, cols = rows[keep], cols[keep]
+            a, b = order[rows + start], order[cols + start]
+            found.append((d2[rows, cols], np.minimum(a, b), np.maximum(a, b)))
+
+        d2, i, j = (np.concatenate(arrays) for arrays in zip(*found))
+        ranking = np.lexsort((j, i, d2))
+        return d2[ranking], i[ranking], j[ranking]
+
+
+def closest_index_pairs(points: list[Point] | PointArray) -> Iterator[tuple[int, int]]:
+    """Lazily yield all pairs of point indices by increasing distance.
+    Pairs are produced in shells of squared distance that double in size,
+    so only one shell is held in memory at a time.
+    """
+    if len(points) < 2:
+        return
+    if not isinstance(points, PointArray):
+        points = PointArray(points)
+    extents = [int(axis.max() - axis.min()) for axis in (points.x, points.y, points.z)]
+    max_d2 = sum(e * e for e in extents)
+    # Start around the mean spacing, where about n pairs are expected
+    volume = prod(max(e, 1) for e in extents)
+    high = max(1, int((volume / len(points)) ** (2 / 3)))
+    low = -1
+    while True:
+        _, i, j = points.pairs_in_shell(low, high)
+        yield from zip(i.tolist(), j.tolist())
+        if high >= max_d2:
+            return
+        low, high = high, high * 2
+
+
+def closest_pairs(points: list[Point]) -> Iterator[tuple[Point, Point]]:
+    """Lazily yield all pairs of points by increasing distance."""
+    for i, j in closest_index_pairs(points):
+        yield points[i], points[j]
 
 
 class UnionFind:
@@ -80,10 +165,57 @@ class UnionFind:
             connected_sets[root].add(element)
         return list(connected_sets.values())
 
+    def component_sizes(self) -> list[int]:
+        """Return the size of each connected component."""
+        return list(Counter(self.find(element) for element in self.parent).values())
+
+
+class CompactUnionFind:
+    """Union-Find over integer ids 0..size-1, backed by flat arrays.
+    Uses iterative path halving and union by size, so component sizes
+    are available in O(1).
+    """
+
+    def __init__(self, size: int):
+        self.parent = array("i", range(size))
+        self.size = array("i", [1]) * size
+
+    def find(self, x: int) -> int:
+        """Find the root representative of the set containing x."""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]  # Path halving
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> bool:
+        """Merge the sets containing ids a and b."""
+        root_a = self.find(a)
+        root_b = self.find(b)
+
+        if root_a == root_b:
+            return False  # Already in same set
+
+        # Union by size
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
 
-def union_find_sets(pairs):
+        return True  # Sets were merged
+
+    def component_size(self, x: int) -> int:
+        """Return the size of the component containing x."""
+        return self.size[self.find(x)]
+
+    def component_sizes(self) -> list[int]:
+        """Return the size of each connected component."""
+        return [self.size[x] for x, root in enumerate(self.parent) if x == root]
+
+
+def union_find_sets(pairs: Iterable):
     """Union-Find to build connected components.
-    Args: pairs: List of (element1, element2) tuples.
+    Args: pairs: Iterable of (element1, element2) tuples.
     Returns: List of connected component sets.
     """
     uf = UnionFind()
@@ -92,15 +224,24 @@ def union_find_sets(pairs):
     return uf.get_connected_sets()
 
 
-def kruskal_mst_edges(pairs):
+def kruskal_mst_edges(
+    pairs: Iterable,
+    num_elements: int | None = None,
+    uf: UnionFind | CompactUnionFind | None = None,
+):
     """Kruskal's algorithm: find Minimum Spanning Tree (MST).
     Assumes pairs are sorted by weight (distance).
-    Args: pairs: List of (element1, element2) tuples.
+    Args: pairs: Iterable of (element1, element2) tuples, possibly lazy.
+          num_elements: Number of elements, required to stop a lazy source early.
+          uf: Union-Find to use, e.g. a CompactUnionFind for integer ids.
     Returns: List of edges in the MST.
     """
-    uf = UnionFind()
+    uf = uf if uf is not None else UnionFind()
     mst_edges = []
-    max_edges = len(set(p for pair in pairs for p in pair)) - 1
+    if num_elements is None:
+        pairs = list(pairs)
+        num_elements = len(set(p for pair in pairs for p in pair))
+    max_edges = num_elements - 1
 
     for pair in pairs:
         if uf.union(*pair):
@@ -111,16 +252,83 @@ def kruskal_mst_edges(pairs):
     return mst_edges
 
 
-def day08_part1(sorted_pairs: list[tuple[Point, Point]], max_connections) -> int:
-    disjoint_sets = union_find_sets(sorted_pairs[:max_connections])
-    three_largest = sorted(disjoint_sets, key=len, reverse=True)[:3]
-    return prod(len(component) for component in three_largest)
+def prim_longest_edge(points: list[Point]) -> tuple[Point, Point]:
+    """Prim's algorithm on the complete graph, one NumPy row at a time.
+    O(n²) time and O(n) memory, no pair list.
+    Edges are ordered by (distance², i, j) with i < j, as Kruskal sorts them,
+    so ties give the same tree and the same longest edge.
+    Returns: The longest MST edge, i.e. the last edge Kruskal would add.
+    """
+    # Points not yet in the tree are kept in the first `size` slots
+    n = len(points)
+    point_array = PointArray(points)
+    coords = np.stack([point_array.x, point_array.y, point_array.z])
+    ids = np.arange(n)
+    best = np.full(n, np.iinfo(np.int64).max)  # squared distance to tree
+    best_pair = np.zeros(n, dtype=np.int64)  # i * n + j of that edge, i < j
+    parent = np.zeros(n, dtype=np.intp)
+
+    current = 0
+    longest = (-1, -1, 0, 0)
+    for size in range(n - 1, 0, -1):
+        # Move the new tree point out of the active prefix
+        for arr in (coords, ids, best, best_pair, parent):
+            arr[..., [current, size]] = arr[..., [size, current]]
+        x, y, z = coords[:, size]
+        d2 = (coords[0, :size] - x) ** 2
+        d2 += (coords[1, :size] - y) ** 2
+        d2 += (coords[2, :size] - z) ** 2
+        new_id = ids[size]
+        pair = np.minimum(ids[:size], new_id) * n + np.maximum(ids[:size], new_id)
+        closer = (d2 < best[:size]) | ((d2 == best[:size]) & (pair < best_pair[:size]))
+        best[:size][closer] = d2[closer]
+        best_pair[:size][closer] = pair[closer]
+        parent[:size][closer] = new_id
+
+        # Closest point, ties broken by the edge's (i, j)
+        ties = np.flatnonzero(best[:size] == best[:size].min())
+        current = int(ties[np.argmin(best_pair[ties])])
+        edge = (int(best[current]), int(best_pair[current]))
+        if edge > longest[:2]:
+            longest = (*edge, int(parent[current]), int(ids[current]))
+
+    _, _, a, b = longest
+    return points[min(a, b)], points[max(a, b)]
+
+
+def day08_part1(points: list[Point], max_connections) -> int:
+    uf = CompactUnionFind(len(points))
+    for i, j in islice(closest_index_pairs(points), max_connections):
+        uf.union(i, j)
+    return prod(sorted(uf.component_sizes(), reverse=True)[:3])
+
+
+def day08_part2(points: list[Point], engine: str = "kruskal") -> int:
+    if engine == "prim":
+        last_a, last_b = prim_longest_edge(points)
+    else:
+        mst_edges = kruskal_mst_edges(
+            closest_index_pairs(points), len(points), CompactUnionFind(len(points))
+        )
+        last_a, last_b = (points[i] for i in mst_edges[-1])
+    return last_a.x * last_b.x
 
 
-def day08_part2(sorted_pairs: list[tuple[Point, Point]]) -> int:
-    mst_edges = kruskal_mst_edges(sorted_pairs)
-    last_a, last_b = mst_edges[-1]
-    return last_a.x * last_b.x
+def benchmark_part2(sizes=(1_000, 5_000, 20_000)) -> None:
+    """Compare the Kruskal and Prim engines on random points."""
+    rng = random.Random(8)
+    for n in sizes:
+        points = [
+            Point(
+                rng.randrange(100_000), rng.randrange(100_000), rng.randrange(100_000)
+            )
+            for _ in range(n)
+        ]
+        for engine in ("kruskal", "prim"):
+            start = time.perf_counter()
+            result = day08_part2(points, engine)
+            elapsed = time.perf_counter() - start
+            print(f"n={n:>6} {engine:>8}: {elapsed:8.3f}s  ({result})")
 
 
 @pytest.fixture(autouse=True, name="test_data")
@@ -134,13 +342,64 @@ def test_day08_part1(test_data):
 
 def test_day08_part2(test_data):
     assert day08_part2(test_data) == 25272
+    assert day08_part2(test_data, engine="prim") == 25272
+
+
+def test_prim_matches_kruskal_with_ties():
+    # Small integer grids have many equal distances
+    rng = random.Random(3)
+    for _ in range(200):
+        points = list(
+            {
+                Point(rng.randrange(4), rng.randrange(4), rng.randrange(3))
+                for _ in range(rng.randint(2, 20))
+            }
+        )
+        if len(points) < 2:
+            continue
+        mst_edges = kruskal_mst_edges(
+            closest_index_pairs(points), len(points), CompactUnionFind(len(points))
+        )
+        expected = tuple(points[i] for i in mst_edges[-1])
+        assert prim_longest_edge(points) == expected
+        assert day08_part2(points, engine="prim") == day08_part2(points)
+
+
+def test_closest_pairs(test_data):
+    expected = sorted(
+        combinations(test_data, 2), key=lambda pair: pair[0].squared_distance(pair[1])
+    )
+    assert list(closest_pairs(test_data)) == expected
+    point_array = PointArray(test_data)
+    assert [point_array[i] for i in range(len(point_array))] == test_data
+
+
+def test_compact_union_find(test_data):
+    pairs = list(islice(closest_index_pairs(test_data), 10))
+    uf = UnionFind()
+    compact_uf = CompactUnionFind(len(test_data))
+    for i, j in pairs:
+        assert uf.union(i, j) == compact_uf.union(i, j)
+    assert sorted(uf.component_sizes()) == sorted(
+        size for size in compact_uf.component_sizes() if size > 1
+    )
+
+    # A long chain must not hit the recursion limit
+    chain_uf = CompactUnionFind(100_000)
+    for i in range(1, 100_000):
+        chain_uf.parent[i] = i - 1
+    assert chain_uf.find(99_999) == 0
 
 
 if __name__ == "__main__":
-    pairs = parse_input("data/day08.txt")
+    if "--bench" in sys.argv:
+        benchmark_part2()
+        sys.exit()
+
+    input_data = parse_input("data/day08.txt")
 
     print("Day 08 Part 1:")
-    print(day08_part1(pairs, 1000))
+    print(day08_part1(input_data, 1000))
 
     print("Day 08 Part 2:")
-    print(day08_part2(pairs))
+    print(day08_part2(input_data))
@@ -3,9 +3,14 @@ Advent of Code 2025
 Day 09: Movie Theater
 """
 
+import heapq
+import random
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from itertools import chain, combinations, pairwise
+from itertools import accumulate, chain, combinations, pairwise
 
+import numpy as np
 import pytest
 
 
@@ -41,6 +46,189 @@ class Rectangle:
         )
 
 
+class PointArray:
+    """Columnar point set: one int64 array per coordinate.
+    Indexing returns a Point, so it can stand in for a list of points.
+    """
+
+    def __init__(self, points: Iterable[Point]):
+        coords = np.array([(p.x, p.y) for p in points], dtype=np.int64)
+        self.x, self.y = coords.reshape(-1, 2).T.copy()
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __getitem__(self, idx: int) -> Point:
+        return Point(int(self.x[idx]), int(self.y[idx]))
+
+    def max_pair_area(self, block: int = 1024) -> int:
+        """Largest Rectangle area over all pairs, computed in row blocks
+        so that at most block * n areas are held at once."""
+        best = 0
+        for start in range(0, len(self), block):
+            rows = slice(start, start + block)
+            areas = (np.abs(self.x[rows, None] - self.x[None, start:]) + 1) * (
+                np.abs(self.y[rows, None] - self.y[None, start:]) + 1
+            )
+            best = max(best, int(areas.max()))
+        return best
+
+
+class PolygonIndex:
+    """Containment index for the polygon through the given points.
+    Coordinates are compressed to the point coordinates and the non-empty
+    gaps between them. The outside of the polygon is flood filled on that
+    grid and summed into a 2D prefix table, so a rectangle is inside
+    exactly when it covers no outside cell.
+    """
+
+    def __init__(self, points: list[Point]):
+        self.x_index, width = self._compress(p.x for p in points)
+        self.y_index, height = self._compress(p.y for p in points)
+
+        # Rasterise the boundary, then flood fill the outside from a corner
+        boundary = bytearray(width * height)
+        for a, b in pairwise(chain(points, points[:1])):
+            edge = Rectangle(a, b)
+            x0, x1 = self.x_index[edge.min_corner.x], self.x_index[edge.max_corner.x]
+            y0, y1 = self.y_index[edge.min_corner.y], self.y_index[edge.max_corner.y]
+            for y in range(y0, y1 + 1):
+                boundary[y * width + x0 : y * width + x1 + 1] = b"\x01" * (x1 - x0 + 1)
+
+        outside = bytearray(width * height)
+        outside[0] = 1
+        stack = [0]
+        while stack:
+            cell = stack.pop()
+            y, x = divmod(cell, width)
+            for ok, other in (
+                (x > 0, cell - 1),
+                (x < width - 1, cell + 1),
+                (y > 0, cell - width),
+                (y < height - 1, cell + width),
+            ):
+                if ok and not outside[other] and not boundary[other]:
+                    outside[other] = 1
+                    stack.append(other)
+
+        # prefix[y][x] counts outside cells in rows < y and columns < x
+        self.prefix = [[0] * (width + 1)]
+        for y in range(height):
+            row = accumulate(outside[y * width : (y + 1) * width], initial=0)
+            self.prefix.append([a + b for a, b in zip(self.prefix[-1], row)])
+
+    @staticmethod
+    def _compress(values) -> tuple[dict[int, int], int]:
+        """Map each coordinate to a grid index, leaving a cell for every
+        non-empty gap (and the outer margins). Returns the map and grid size."""
+        index = {}
+        size = 0
+        previous = None
+        for value in sorted(set(values)):
+            size += 1 if previous is not None and value == previous + 1 else 2
+            index[value] = size - 1
+            previous = value
+        return index, size + 1
+
+    def contains(self, rect: Rectangle) -> bool:
+        """Check that the rectangle lies fully inside the polygon, in O(1)."""
+        x0 = self.x_index[rect.min_corner.x]
+        x1 = self.x_index[rect.max_corner.x] + 1
+        y0 = self.y_index[rect.min_corner.y]
+        y1 = self.y_index[rect.max_corner.y] + 1
+        p = self.prefix
+        return p[y1][x1] - p[y0][x1] - p[y1][x0] + p[y0][x0] == 0
+
+
+class EdgeTree:
+    """Merge-sort tree over edges (key, low, high) sorted by key. Every node
+    keeps its edges' lows in order with the running maximum of their highs,
+    so asking whether an edge with low < key < high crosses the open span
+    (span_low, span_high) costs O(log² n): O(log n) nodes cover the key
+    range, and one bisect per node finds the edges starting below
+    span_high, whose largest end is then compared with span_low.
+    """
+
+    def __init__(self, edges: list[tuple[int, int, int]]):
+        edges = sorted(edges)
+        self.size = len(edges)
+        self.keys = [key for key, _, _ in edges]
+        self.lows: list[list[int]] = [[] for _ in range(2 * self.size)]
+        self.max_highs: list[list[int]] = [[] for _ in range(2 * self.size)]
+        nodes: list[list[tuple[int, int]]] = [[] for _ in range(2 * self.size)]
+        for i, (_, low, high) in enumerate(edges):
+            nodes[self.size + i] = [(low, high)]
+        for node in range(self.size - 1, 0, -1):
+            nodes[node] = sorted(nodes[2 * node] + nodes[2 * node + 1])
+        for node, node_edges in enumerate(nodes):
+            self.lows[node] = [low for low, _ in node_edges]
+            self.max_highs[node] = list(accumulate((h for _, h in node_edges), max))
+
+    def _node_crosses(self, node: int, span_low: int, span_high: int) -> bool:
+        count = bisect_left(self.lows[node], span_high)
+        return count > 0 and self.max_highs[node][count - 1] > span_low
+
+    def crosses(self, low: int, high: int, span_low: int, span_high: int) -> bool:
+        left = bisect_right(self.keys, low) + self.size
+        right = bisect_left(self.keys, high) + self.size
+        while left < right:
+            if left & 1:
+                if self._node_crosses(left, span_low, span_high):
+                    return True
+                left += 1
+            if right & 1:
+                right -= 1
+                if self._node_crosses(right, span_low, span_high):
+                    return True
+            left >>= 1
+            right >>= 1
+        return False
+
+
+class EdgeIndex:
+    """Polygon edges in one EdgeTree per direction, so a rectangle only
+    finds the edges strictly inside its x/y span that cross its other span,
+    in O(log² n) rather than scanning every edge in the first span."""
+
+    def __init__(self, points: list[Point]):
+        vertical = []
+        horizontal = []
+        for a, b in pairwise(chain(points, points[:1])):
+            if a.x == b.x:
+                vertical.append((a.x, min(a.y, b.y), max(a.y, b.y)))
+            else:
+                horizontal.append((a.y, min(a.x, b.x), max(a.x, b.x)))
+        self.vertical = EdgeTree(vertical)
+        self.horizontal = EdgeTree(horizontal)
+
+    def contains(self, rect: Rectangle) -> bool:
+        """Same test as checking Rectangle.overlaps against every edge."""
+        lo, hi = rect.min_corner, rect.max_corner
+        return not (
+            self.vertical.crosses(lo.x, hi.x, lo.y, hi.y)
+            or self.horizontal.crosses(lo.y, hi.y, lo.x, hi.x)
+        )
+
+
+def largest_contained(
+    points: list[Point], is_contained: Callable[[Rectangle], bool]
+) -> tuple[int, int]:
+    """Check candidate rectangles largest first, stopping at the first
+    contained one. Returns its area and the number of candidates examined."""
+    candidates = [
+        (-(abs(a.x - b.x) + 1) * (abs(a.y - b.y) + 1), i, j)
+        for (i, a), (j, b) in combinations(enumerate(points), 2)
+    ]
+    heapq.heapify(candidates)
+    examined = 0
+    while candidates:
+        neg_area, i, j = heapq.heappop(candidates)
+        examined += 1
+        if is_contained(Rectangle(points[i], points[j])):
+            return -neg_area, examined
+    return 0, examined
+
+
 def parse_input(file_name: str) -> list[Point]:
     with open(file_name, "r", encoding="ascii") as data_file:
         return [
@@ -49,10 +237,15 @@ def parse_input(file_name: str) -> list[Point]:
 
 
 def day09_part1(points: list[Point]) -> int:
-    return max(Rectangle(a, b).area for a, b in combinations(points, 2))
+    return PointArray(points).max_pair_area()
 
 
-def day09_part2(points: list[Point]) -> int:
+def day09_part2(points: list[Point], engine: str = "index") -> int:
+    if engine == "index":
+        return largest_contained(points, PolygonIndex(points).contains)[0]
+    if engine == "sweep":
+        return largest_contained(points, EdgeIndex(points).contains)[0]
+
     # we define edges as rectangles between consecutive points (with
     # pairwise) and wrap around the list of points (with chain)
     edges = [Rectangle(a, b) for a, b in pairwise(chain(points, points[:1]))]
@@ -79,8 +272,48 @@ def test_day09_part1(test_data):
     assert day09_part1(test_data) == 50
 
 
+def test_point_array(test_data):
+    point_array = PointArray(test_data)
+    assert [point_array[i] for i in range(len(point_array))] == test_data
+    assert point_array.max_pair_area(block=3) == max(
+        Rectangle(a, b).area for a, b in combinations(test_data, 2)
+    )
+
+
 def test_day09_part2(test_data):
     assert day09_part2(test_data) == 24
+    assert day09_part2(test_data, engine="sweep") == 24
+    assert day09_part2(test_data, engine="edges") == 24
+
+
+def test_largest_contained(test_data):
+    assert largest_contained(test_data, EdgeIndex(test_data).contains) == (24, 9)
+
+
+def test_polygon_index(test_data):
+    index = PolygonIndex(test_data)
+    assert index.contains(Rectangle(Point(9, 5), Point(2, 3)))
+    assert index.contains(Rectangle(Point(7, 1), Point(11, 5)))
+    assert not index.contains(Rectangle(Point(7, 1), Point(11, 7)))
+    assert not index.contains(Rectangle(Point(2, 5), Point(11, 1)))
+    assert not index.contains(Rectangle(Point(2, 3), Point(7, 1)))
+
+
+def test_edge_tree():
+    rng = random.Random(9)
+    edges = []
+    for _ in range(200):
+        low = rng.randrange(100)
+        edges.append((rng.randrange(100), low, low + rng.randrange(1, 30)))
+    tree = EdgeTree(edges)
+    for _ in range(500):
+        low, high = sorted(rng.sample(range(110), 2))
+        span_low, span_high = sorted(rng.sample(range(140), 2))
+        expected = any(
+            low < key < high and lo < span_high and hi > span_low
+            for key, lo, hi in edges
+        )
+        assert tree.crosses(low, high, span_low, span_high) == expected
 
 
 if __name__ == "__main__":
@@ -90,4 +323,6 @@ if __name__ == "__main__":
     print(day09_part1(input_data))
 
     print("Day 09 Part 2:")
-    print(day09_part2(input_data))
+    area, examined = largest_contained(input_data, PolygonIndex(input_data).contains)
+    print(area)
+    print(f"({examined} of {len(input_data) * (len(input_data) - 1) // 2} examined)")
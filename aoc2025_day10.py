@@ -3,8 +3,18 @@ Advent of Code 2025
 Day 10: Factory
 """
 
+import json
+import logging
+import os
+import random
 import re
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from fractions import Fraction
+from math import lcm
 
 import pytest
 from pulp import PULP_CBC_CMD, LpMinimize, LpProblem, LpVariable, lpSum  # type: ignore
@@ -13,6 +23,17 @@ from pulp import PULP_CBC_CMD, LpMinimize, LpProblem, LpVariable, lpSum  # type:
 Matrix = list[list[int]]
 Vector = list[int]
 PivotCols = list[int]
+SystemKey = tuple[int, tuple[int, ...], tuple[tuple[int, ...], ...]]
+
+# Above this many free variables, enumerating the GF(2) null space is
+# replaced by meet-in-the-middle or BFS over light states
+GF2_FREE_VARIABLE_LIMIT = 16
+
+# Above this many buttons, the 2^n press patterns of the halving solver
+# are too many and the branch-and-bound solver is used instead
+HALVING_BUTTON_LIMIT = 16
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -49,6 +70,14 @@ class Machine:
 
         return cls(lights=lights, buttons=buttons, joltage=joltage)
 
+    def canonical_key(self, part: int) -> SystemKey:
+        """Key identifying the system solved for a part, whatever the button order.
+        Each button becomes a sorted tuple of counters and the buttons are sorted.
+        """
+        target = self.lights if part == 1 else self.joltage
+        buttons = sorted(tuple(sorted(set(button))) for button in self.buttons)
+        return part, tuple(target), tuple(buttons)
+
     def _build_coefficient_matrix(self, num_vars: int) -> Matrix:
         """Build coefficient matrix where rows are variables,
         columns are buttons affecting the variables."""
@@ -57,20 +86,26 @@ class Machine:
             for var_idx in range(num_vars)
         ]
 
+    def _build_button_masks(self) -> list[int]:
+        """Build one bitmask per button: bit i is set if it toggles light i."""
+        return [sum(1 << i for i in set(button)) for button in self.buttons]
+
     def solve_turn_on(self) -> int | None:
         """Solve the lights puzzle using boolean linear algebra over GF(2).
         Returns the minimum number of buttons to press, or None if no solution exists.
         """
-        a = self._build_coefficient_matrix(len(self.lights))
-        solution = solve_system_gf2_minweight(a, self.lights)
-        return solution.count(1) if solution else None
+        target = sum(light << i for i, light in enumerate(self.lights))
+        return min_presses_gf2(self._build_button_masks(), target, len(self.lights))
 
-    def solve_joltage(self) -> int | None:
+    def solve_joltage(self, backend: str = "native") -> int | None:
         """Solve for button presses to achieve target joltage values (integer system).
         Returns the sum of button presses with minimum weight, or None if no solution exists.
         """
         a = self._build_coefficient_matrix(len(self.joltage))
-        solution = solve_system_integer_minweight(a, self.joltage)
+        if backend == "pulp":
+            solution = solve_system_integer_minweight(a, self.joltage)
+        else:
+            solution = solve_system_integer_minweight_native(a, self.joltage)
         return sum(solution) if solution else None
 
 
@@ -148,6 +183,161 @@ def solve_system_gf2_minweight(a: Matrix, b: Vector) -> Vector | None:
     return min(solutions, key=sum) if solutions else None
 
 
+def solve_system_gf2_bitmask_minweight(rows: list[int], n: int) -> int | None:
+    """Solve Ax=b in GF(2) with each row of [A|b] packed into one int,
+    where bit j < n is column j and bit n is b.
+    Returns the minimum-weight solution as a bitmask, or None if the system
+    is inconsistent. Free variables are walked in Gray-code order, so each
+    candidate costs one XOR and a popcount.
+    """
+    rows = list(rows)
+    pivots: list[tuple[int, int]] = []  # (column, row)
+    current_row = 0
+
+    for col in range(n):
+        bit = 1 << col
+        pivot = next((i for i in range(current_row, len(rows)) if rows[i] & bit), None)
+        if pivot is None:
+            continue
+        rows[current_row], rows[pivot] = rows[pivot], rows[current_row]
+        pivot_row = rows[current_row]
+        for i, row in enumerate(rows):
+            if i != current_row and row & bit:
+                rows[i] = row ^ pivot_row
+        pivots.append((col, current_row))
+        current_row += 1
+
+    # Any remaining row is all zeros in the coefficient part
+    if any(rows[i] for i in range(current_row, len(rows))):
+        return None
+
+    # Particular solution with all free variables at 0
+    target_bit = 1 << n
+    solution = sum(1 << col for col, row in pivots if rows[row] & target_bit)
+
+    # Flipping free variable f also flips every pivot variable whose row uses f
+    pivot_cols = {col for col, _ in pivots}
+    flips = [
+        (1 << f) | sum(1 << col for col, row in pivots if rows[row] >> f & 1)
+        for f in range(n)
+        if f not in pivot_cols
+    ]
+
+    best = solution
+    best_weight = solution.bit_count()
+    for step in range(1, 1 << len(flips)):
+        # Gray code: step flips the variable at the lowest set bit of step
+        solution ^= flips[(step & -step).bit_length() - 1]
+        if (weight := solution.bit_count()) < best_weight:
+            best, best_weight = solution, weight
+
+    return best
+
+
+def gf2_rank(vectors: list[int]) -> int:
+    """Rank of a set of GF(2) vectors packed as ints, via an XOR basis."""
+    basis: list[int] = []
+    for vector in vectors:
+        for b in basis:
+            vector = min(vector, vector ^ b)
+        if vector:
+            basis.append(vector)
+    return len(basis)
+
+
+def xor_subset_weights(masks: list[int]) -> dict[int, int]:
+    """Map every XOR of a subset of masks to the smallest subset size reaching it."""
+    weights = {0: 0}
+    for mask in masks:
+        for state, weight in list(weights.items()):
+            other = state ^ mask
+            if other not in weights or weights[other] > weight + 1:
+                weights[other] = weight + 1
+    return weights
+
+
+def min_presses_meet_in_middle(button_masks: list[int], target: int) -> int | None:
+    """Split the buttons in two halves, tabulate the XOR-sums of each half
+    and match them up: O(2^(n/2)) instead of O(2^n)."""
+    half = len(button_masks) // 2
+    left = xor_subset_weights(button_masks[:half])
+    right = xor_subset_weights(button_masks[half:])
+    return min(
+        (
+            weight + left[state ^ target]
+            for state, weight in right.items()
+            if state ^ target in left
+        ),
+        default=None,
+    )
+
+
+def min_presses_bfs(button_masks: list[int], target: int) -> int | None:
+    """Bidirectional BFS over light states. Pressing a button is its own
+    inverse, so the search from the target is the search from 0 shifted
+    by target, and a single ball of states around 0 serves both sides."""
+    distance = {0: 0}
+    frontier = [0]
+    depth = 0
+    while frontier:
+        best = min(
+            (
+                distance[s] + distance[s ^ target]
+                for s in frontier
+                if s ^ target in distance
+            ),
+            default=None,
+        )
+        if best is not None:
+            return best
+        depth += 1
+        next_frontier = []
+        for state in frontier:
+            for mask in button_masks:
+                if (other := state ^ mask) not in distance:
+                    distance[other] = depth
+                    next_frontier.append(other)
+        frontier = next_frontier
+    return None
+
+
+def min_presses_gf2(
+    button_masks: list[int],
+    target: int,
+    num_lights: int,
+    free_limit: int = GF2_FREE_VARIABLE_LIMIT,
+) -> int | None:
+    """Minimum number of buttons whose XOR is target, or None if unreachable.
+    Uses the Gray-code null-space walk when there are at most free_limit free
+    variables, otherwise the cheaper of meet-in-the-middle (2^(n/2) states)
+    and BFS over light states (2^lights states).
+    """
+    n = len(button_masks)
+    free = n - gf2_rank(button_masks)
+    if free <= free_limit:
+        rows = [
+            sum((mask >> i & 1) << j for j, mask in enumerate(button_masks))
+            | (target >> i & 1) << n
+            for i in range(num_lights)
+        ]
+        solution = solve_system_gf2_bitmask_minweight(rows, n)
+        return solution.bit_count() if solution is not None else None
+
+    mitm_cost = 2 ** (n - n // 2) + 2 ** (n // 2)
+    bfs_cost = 2**num_lights * n
+    strategy = "meet-in-the-middle" if mitm_cost <= bfs_cost else "bfs"
+    logger.info(
+        "%d free variables over %d buttons and %d lights: using %s",
+        free,
+        n,
+        num_lights,
+        strategy,
+    )
+    if strategy == "bfs":
+        return min_presses_bfs(button_masks, target)
+    return min_presses_meet_in_middle(button_masks, target)
+
+
 def solve_system_integer_minweight(a: Matrix, b: Vector) -> Vector | None:
     """Solve Ax=b over integers using PuLP."""
     m = len(a)
@@ -175,22 +365,367 @@ def solve_system_integer_minweight(a: Matrix, b: Vector) -> Vector | None:
     return solution
 
 
-def day10_part1(machines: list[Machine]) -> int:
-    return sum(
-        result
-        for result in (machine.solve_turn_on() for machine in machines)
-        if result is not None
-    )
+def solve_system_integer_minweight_halving(a: Matrix, b: Vector) -> Vector | None:
+    """Solve Ax=b over non-negative integers for 0/1 matrices by halving.
+    Any solution is x = s + 2y with s = x mod 2, so A s matches b mod 2 and
+    A y = (b - A s) / 2, which is solved the same way, memoised on the
+    target. Each level tries the 0/1 patterns s with the right parity in
+    order of |s| and stops once |s| alone reaches the best total found.
+    Counter vectors are packed into one int with a guard bit per lane, so
+    a pattern fits under the target when no guard bit is borrowed.
+    """
+    m = len(a)
+    n = len(a[0])
+    if not any(b):
+        return [0] * n
+    # A lane holds a target or up to n presses of one pattern, plus a guard bit
+    lane = max(max(b), n).bit_length() + 1
+    guard = sum(1 << (i * lane + lane - 1) for i in range(m))
+    low_bits = sum(1 << (i * lane) for i in range(m))
+    columns = [sum(a[i][j] << (i * lane) for i in range(m)) for j in range(n)]
+
+    # Effect of every press pattern, grouped by the parity it produces
+    effects = [0] * (1 << n)
+    for pattern in range(1, 1 << n):
+        j = (pattern & -pattern).bit_length() - 1
+        effects[pattern] = effects[pattern & (pattern - 1)] + columns[j]
+    by_parity: dict[int, list[tuple[int, int, int]]] = {}
+    for pattern in sorted(range(1 << n), key=int.bit_count):
+        effect = effects[pattern]
+        by_parity.setdefault(effect & low_bits, []).append(
+            (pattern.bit_count(), effect, pattern)
+        )
+
+    # best[target] = (presses, pattern pressed at this level), None if unsolvable
+    best: dict[int, tuple[int, int] | None] = {0: (0, 0)}
+
+    def solve(target: int) -> int | None:
+        if target in best:
+            found = best[target]
+            return found[0] if found else None
+        result = None
+        borrow_check = target | guard
+        for size, effect, pattern in by_parity.get(target & low_bits, []):
+            if result is not None and size >= result[0]:
+                break
+            if (borrow_check - effect) & guard != guard:
+                continue  # some counter would go negative
+            rest = solve((target - effect) >> 1)
+            if rest is not None and (result is None or size + 2 * rest < result[0]):
+                result = (size + 2 * rest, pattern)
+        best[target] = result
+        return result[0] if result else None
+
+    target = sum(v << (i * lane) for i, v in enumerate(b))
+    if solve(target) is None:
+        return None
+    solution = [0] * n
+    level = 0
+    while target:
+        found = best[target]
+        assert found is not None
+        pattern = found[1]
+        for j in range(n):
+            solution[j] += (pattern >> j & 1) << level
+        target = (target - effects[pattern]) >> 1
+        level += 1
+    return solution
 
 
-def day10_part2(machines: list[Machine]) -> int:
-    return sum(
-        result
-        for result in (machine.solve_joltage() for machine in machines)
-        if result is not None
+def solve_system_integer_minweight_native(a: Matrix, b: Vector) -> Vector | None:
+    """Solve Ax=b over non-negative integers for 0/1 matrices, in process,
+    by halving, or by branch and bound above HALVING_BUTTON_LIMIT buttons."""
+    if len(a[0]) <= HALVING_BUTTON_LIMIT:
+        return solve_system_integer_minweight_halving(a, b)
+    logger.info("%d buttons: using branch and bound instead of halving", len(a[0]))
+    return solve_system_integer_minweight_branch_and_bound(a, b)
+
+
+def solve_system_integer_minweight_branch_and_bound(
+    a: Matrix, b: Vector
+) -> Vector | None:
+    """Solve Ax=b over non-negative integers for 0/1 matrices, in process.
+    Gauss-Jordan elimination over the rationals exposes the free variables,
+    then a branch-and-bound search assigns them within the caps implied by
+    b (a button cannot be pressed more often than any counter it feeds).
+    """
+    m = len(a)
+    n = len(a[0])
+    caps = [min((b[i] for i in range(m) if a[i][j]), default=0) for j in range(n)]
+    # Identical buttons are interchangeable, so only the first one is used
+    columns = [tuple(row[j] for row in a) for j in range(n)]
+    for j in range(n):
+        if columns.index(columns[j]) != j:
+            caps[j] = 0
+
+    rows = [[Fraction(v) for v in row] + [Fraction(item)] for row, item in zip(a, b)]
+    pivot_cols: PivotCols = []
+    # Pivot on the buttons with the largest caps first, so that the free
+    # variables left for the search have the fewest candidate values
+    for col in sorted(range(n), key=lambda j: -caps[j]):
+        r = len(pivot_cols)
+        pivot = next((i for i in range(r, m) if rows[i][col]), None)
+        if pivot is None:
+            continue
+        rows[r], rows[pivot] = rows[pivot], rows[r]
+        rows[r] = [v / rows[r][col] for v in rows[r]]
+        for i in range(m):
+            if i != r and rows[i][col]:
+                factor = rows[i][col]
+                rows[i] = [v - factor * w for v, w in zip(rows[i], rows[r])]
+        pivot_cols.append(col)
+
+    if any(row[-1] for row in rows[len(pivot_cols) :]):
+        return None
+
+    free_cols = [j for j in range(n) if j not in pivot_cols]
+
+    # Scale each pivot row to integers: div * x_pivot + sum(coef * x_free) = rhs
+    divs, coefs, rhs = [], [], []
+    for row in rows[: len(pivot_cols)]:
+        scale = lcm(*(v.denominator for v in row))
+        divs.append(scale)
+        coefs.append([int(row[f] * scale) for f in free_cols])
+        rhs.append(int(row[-1] * scale))
+
+    # Objective scaled by lcm(divs): sum(x) * obj_scale
+    #   = obj_scale * sum(x_free) + sum(residual_k * obj_scale / div_k)
+    obj_scale = lcm(*divs)
+    row_weights = [obj_scale // d for d in divs]
+    free_weights = [
+        obj_scale - sum(coefs[k][f] * row_weights[k] for k in range(len(divs)))
+        for f in range(len(free_cols))
+    ]
+
+    # Reachable change of each residual from the free variables not yet assigned
+    num_free = len(free_cols)
+    min_rest = [[0] * (num_free + 1) for _ in divs]
+    max_rest = [[0] * (num_free + 1) for _ in divs]
+    weight_rest = [0] * (num_free + 1)
+    for f in reversed(range(num_free)):
+        cap = caps[free_cols[f]]
+        weight_rest[f] = weight_rest[f + 1] + min(0, free_weights[f] * cap)
+        for k, row_coefs in enumerate(coefs):
+            min_rest[k][f] = min_rest[k][f + 1] + min(0, row_coefs[f] * cap)
+            max_rest[k][f] = max_rest[k][f + 1] + max(0, row_coefs[f] * cap)
+
+    best_obj: int | None = None
+    best_free: list[int] = []
+    assignment = [0] * num_free
+
+    def search(f: int, residuals: list[int], obj: int) -> None:
+        nonlocal best_obj, best_free
+        if f == num_free:
+            if all(r % d == 0 for r, d in zip(residuals, divs)):
+                best_obj, best_free = obj, assignment.copy()
+            return
+
+        # Narrow x_f so that every pivot can still land in [0, cap]:
+        # div * x_pivot = residual - coef * x_f - (rest of the free vars)
+        low, high = 0, caps[free_cols[f]]
+        for k, residual in enumerate(residuals):
+            c = coefs[k][f]
+            if c == 0:
+                continue
+            lo = residual - max_rest[k][f + 1] - divs[k] * caps[pivot_cols[k]]
+            hi = residual - min_rest[k][f + 1]
+            if c < 0:
+                lo, hi = -hi, -lo
+            low = max(low, -(-lo // abs(c)))
+            high = min(high, hi // abs(c))
+        if low > high:
+            return
+
+        # Visit values in order of increasing objective, so the bound can stop the loop
+        weight = free_weights[f]
+        values = range(low, high + 1) if weight >= 0 else range(high, low - 1, -1)
+        for value in values:
+            child_obj = obj + weight * value
+            if best_obj is not None and child_obj + weight_rest[f + 1] >= best_obj:
+                break
+            assignment[f] = value
+            search(
+                f + 1, [r - c[f] * value for r, c in zip(residuals, coefs)], child_obj
+            )
+
+    root_obj = sum(r * w for r, w in zip(rhs, row_weights))
+    if all(
+        min_rest[k][0] <= r <= max_rest[k][0] + d * caps[col]
+        for k, (r, d, col) in enumerate(zip(rhs, divs, pivot_cols))
+    ):
+        search(0, rhs, root_obj)
+    if best_obj is None:
+        return None
+
+    solution = [0] * n
+    for f, col in enumerate(free_cols):
+        solution[col] = best_free[f]
+    for k, col in enumerate(pivot_cols):
+        solution[col] = (
+            rhs[k] - sum(c * v for c, v in zip(coefs[k], best_free))
+        ) // divs[k]
+    return solution
+
+
+def random_machine(rng: random.Random, counters: int, max_presses: int = 30) -> Machine:
+    """Build a solvable machine with random buttons and presses, shaped like
+    the puzzle input (a few more buttons than counters)."""
+    buttons = max(1, counters + rng.randint(-1, 3))
+    wiring = [
+        sorted(rng.sample(range(counters), rng.randint(1, counters)))
+        for _ in range(buttons)
+    ]
+    presses = [rng.randint(0, max_presses) for _ in range(buttons)]
+    joltage = [
+        sum(p for button, p in zip(wiring, presses) if i in button)
+        for i in range(counters)
+    ]
+    lights = [rng.randint(0, 1) for _ in range(counters)]
+    return Machine(lights=lights, buttons=wiring, joltage=joltage)
+
+
+def benchmark_part2(num_machines: int = 150, max_presses: int = 120) -> None:
+    """Compare the native and PuLP backends on machines at input scale, with
+    presses up to max_presses and joltages in the hundreds."""
+    rng = random.Random(10)
+    machines = [
+        random_machine(rng, rng.randint(4, 10), max_presses)
+        for _ in range(num_machines)
+    ]
+    for backend in ("native", "pulp"):
+        report = solve_all(machines, 2, backend=backend)
+        elapsed = sum(report.timings)
+        slowest = max(range(num_machines), key=report.timings.__getitem__)
+        print(
+            f"{backend:>6}: {elapsed:7.3f}s  {num_machines / elapsed:8.1f} machines/s"
+            f"  slowest {report.timings[slowest]:.3f}s"
+            f" ({len(machines[slowest].joltage)}x{len(machines[slowest].buttons)})"
+            f"  ({report.total})"
+        )
+
+
+@dataclass
+class SolveReport:
+    """Outcome of solving a batch of machines, in input order."""
+
+    total: int
+    timings: list[float]  # seconds spent on each machine
+    failures: list[int]  # indices of the machines with no solution
+
+
+def solve_machine(task: tuple[Machine, int, str]) -> tuple[int | None, float]:
+    """Solve one machine for the given part, returning the result and its time."""
+    machine, part, backend = task
+    start = time.perf_counter()
+    result = machine.solve_turn_on() if part == 1 else machine.solve_joltage(backend)
+    return result, time.perf_counter() - start
+
+
+class SolverCache:
+    """LRU cache of solved systems, keyed on Machine.canonical_key.
+    If a path is given, entries are loaded from it and written back by save().
+    """
+
+    def __init__(self, maxsize: int = 4096, path: str | None = None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries: OrderedDict[SystemKey, int | None] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="ascii") as cache_file:
+                for part, target, buttons, result in json.load(cache_file):
+                    key = (part, tuple(target), tuple(map(tuple, buttons)))
+                    self.store(key, result)
+
+    def lookup(self, key: SystemKey) -> tuple[bool, int | None]:
+        """Return (found, result) and update the hit/miss counters."""
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return True, self.entries[key]
+        self.misses += 1
+        return False, None
+
+    def store(self, key: SystemKey, result: int | None) -> None:
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with open(self.path, "w", encoding="ascii") as cache_file:
+            json.dump(
+                [[*key, result] for key, result in self.entries.items()], cache_file
+            )
+
+
+def solve_all(
+    machines: list[Machine],
+    part: int,
+    workers: int = 1,
+    backend: str = "native",
+    cache: SolverCache | None = None,
+) -> SolveReport:
+    """Solve every machine, spreading them over a process pool when workers > 1.
+    Results are summed in input order whatever the worker count. With a cache,
+    systems already solved are skipped and each new system is solved once.
+    """
+    outcomes: list[tuple[int | None, float]] = [(None, 0.0)] * len(machines)
+    # Groups of machine indices sharing one system, first index solved
+    groups: list[list[int]] = []
+    keys: list[SystemKey] = []  # cache key of each group, when caching
+    by_key: dict[SystemKey, list[int]] = {}
+    for i, machine in enumerate(machines):
+        if cache is None:
+            groups.append([i])
+            continue
+        key = machine.canonical_key(part)
+        found, result = cache.lookup(key)
+        if found:
+            outcomes[i] = (result, 0.0)
+        elif key in by_key:
+            by_key[key].append(i)
+        else:
+            by_key[key] = [i]
+            groups.append(by_key[key])
+            keys.append(key)
+
+    tasks = [(machines[indices[0]], part, backend) for indices in groups]
+    if workers == 1:
+        solved = list(map(solve_machine, tasks))
+    else:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(workers) as pool:
+            solved = list(pool.map(solve_machine, tasks, chunksize=chunksize))
+
+    if cache is not None:
+        for key, (result, _) in zip(keys, solved):
+            cache.store(key, result)
+    for indices, (result, elapsed) in zip(groups, solved):
+        outcomes[indices[0]] = (result, elapsed)
+        for i in indices[1:]:
+            outcomes[i] = (result, 0.0)
+
+    return SolveReport(
+        total=sum(result for result, _ in outcomes if result is not None),
+        timings=[elapsed for _, elapsed in outcomes],
+        failures=[i for i, (result, _) in enumerate(outcomes) if result is None],
     )
 
 
+def day10_part1(machines: list[Machine], workers: int = 1) -> int:
+    return solve_all(machines, 1, workers).total
+
+
+def day10_part2(
+    machines: list[Machine], backend: str = "native", workers: int = 1
+) -> int:
+    return solve_all(machines, 2, workers, backend).total
+
+
 @pytest.fixture(autouse=True, name="test_data")
 def fixture_test_data():
     return parse_input("data/day10_test.txt")
@@ -200,15 +735,120 @@ def test_day10_part1(test_data):
     assert day10_part1(test_data) == 7
 
 
+def test_solve_all_parallel(test_data):
+    report = solve_all(test_data, 2, workers=2)
+    assert report.total == 33
+    assert report.failures == []
+    assert len(report.timings) == len(test_data)
+
+
+def test_solver_cache(test_data, tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = SolverCache(maxsize=2, path=path)
+    shuffled = Machine(
+        test_data[0].lights, test_data[0].buttons[::-1], test_data[0].joltage
+    )
+    report = solve_all([*test_data, shuffled], 2, cache=cache)
+    assert report.total == 33 + 10
+    assert (cache.hits, cache.misses) == (0, 4)
+    assert len(cache.entries) == 2  # the first machine was evicted
+    cache.save()
+
+    reloaded = SolverCache(path=path)
+    assert solve_all(test_data, 2, cache=reloaded).total == 33
+    assert (reloaded.hits, reloaded.misses) == (2, 1)
+
+
+def test_gf2_strategy_switch(caplog):
+    rng = random.Random(12)
+    caplog.set_level(logging.INFO)
+    for num_lights, num_buttons in [(4, 14), (12, 20)]:
+        masks = [rng.randrange(1, 1 << num_lights) for _ in range(num_buttons)]
+        for target in rng.sample(range(1 << num_lights), 8):
+            expected = min_presses_gf2(masks, target, num_lights, free_limit=64)
+            assert min_presses_gf2(masks, target, num_lights, free_limit=2) == expected
+            assert min_presses_meet_in_middle(masks, target) == expected
+            assert min_presses_bfs(masks, target) == expected
+    assert "using bfs" in caplog.text
+    assert "using meet-in-the-middle" in caplog.text
+
+    # Unreachable target: every button leaves the last light alone
+    assert min_presses_gf2([1, 2, 3] * 8, 4, 3, free_limit=2) is None
+
+
+def test_gf2_bitmask_matches_reference():
+    rng = random.Random(10)
+    for _ in range(300):
+        m, n = rng.randint(1, 6), rng.randint(1, 8)
+        a = [[rng.randint(0, 1) for _ in range(n)] for _ in range(m)]
+        b = [rng.randint(0, 1) for _ in range(m)]
+        rows = [
+            sum(bit << j for j, bit in enumerate(row)) | item << n
+            for row, item in zip(a, b)
+        ]
+        expected = solve_system_gf2_minweight(a, b)
+        result = solve_system_gf2_bitmask_minweight(rows, n)
+        if expected is None:
+            assert result is None
+        else:
+            assert result is not None
+            assert result.bit_count() == sum(expected)
+
+
 def test_day10_part2(test_data):
     assert day10_part2(test_data) == 33
+    assert day10_part2(test_data, backend="pulp") == 33
+
+
+def test_native_integer_solver_matches_pulp():
+    rng = random.Random(9)
+    for max_presses in (30, 120):
+        for _ in range(20):
+            machine = random_machine(rng, rng.randint(2, 10), max_presses)
+            expected = machine.solve_joltage("pulp")
+            assert machine.solve_joltage("native") == expected
+            a = machine._build_coefficient_matrix(len(machine.joltage))
+            solution = solve_system_integer_minweight_branch_and_bound(
+                a, machine.joltage
+            )
+            assert solution is not None and sum(solution) == expected
+
+    # Small and zero targets, often infeasible, with many buttons per counter
+    machines = [
+        Machine(
+            [0, 0, 0], [[0], [0, 1], [0, 1, 2], [0, 2], [1], [0], [0, 2]], [0, 3, 3]
+        ),
+        Machine([0, 0], [[0, 1], [0, 1], [1], [1], [1], [1], [0, 1]], [3, 0]),
+    ]
+    for _ in range(300):
+        counters = rng.randint(1, 3)
+        buttons = [
+            sorted(rng.sample(range(counters), rng.randint(1, counters)))
+            for _ in range(rng.randint(1, 8))
+        ]
+        joltage = [rng.randint(0, 3) for _ in range(counters)]
+        machines.append(Machine([0] * counters, buttons, joltage))
+    for machine in machines:
+        a = machine._build_coefficient_matrix(len(machine.joltage))
+        solution = solve_system_integer_minweight_branch_and_bound(a, machine.joltage)
+        expected = sum(solution) if solution is not None else None
+        assert machine.solve_joltage("native") == expected
+        assert machine.solve_joltage("pulp") == expected
 
 
 if __name__ == "__main__":
-    input_data = parse_input("data/day10.txt")
+    if "--bench" in sys.argv:
+        benchmark_part2()
+        sys.exit()
 
-    print("Day 10 Part 1:")
-    print(day10_part1(input_data))
-
-    print("Day 10 Part 2:")
-    print(day10_part2(input_data))
+    input_data = parse_input("data/day10.txt")
+    workers = os.cpu_count() or 1
+    cache = SolverCache()
+
+    for part in (1, 2):
+        report = solve_all(input_data, part, workers, cache=cache)
+        print(f"Day 10 Part {part}:")
+        print(report.total)
+        slowest = max(report.timings, default=0.0)
+        print(f"(slowest machine {slowest:.3f}s, unsolved {report.failures})")
+    print(f"(solver cache: {cache.hits} hits, {cache.misses} misses)")
@@ -3,52 +3,185 @@ Advent of Code 2025
 Day 11: Reactor
 """
 
-from functools import cache
-
-
-def parse_input(file_name: str) -> dict[str, list[str]]:
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import pytest
+
+
+@dataclass
+class DeviceGraph:
+    """Device graph with names interned to ids 0..n-1 and the outputs of
+    device u stored as targets[offsets[u] : offsets[u + 1]] (CSR layout)."""
+
+    names: list[str]
+    ids: dict[str, int]
+    offsets: array
+    targets: array
+
+    @classmethod
+    def from_devices(cls, devices: dict[str, list[str]]) -> "DeviceGraph":
+        ids: dict[str, int] = {}
+        for name, attached in devices.items():
+            for device in (name, *attached):
+                ids.setdefault(device, len(ids))
+        outputs: list[list[int]] = [[] for _ in ids]
+        for name, attached in devices.items():
+            outputs[ids[name]] = [ids[device] for device in attached]
+        offsets = array("i", [0])
+        targets = array("i")
+        for attached_ids in outputs:
+            targets.extend(attached_ids)
+            offsets.append(len(targets))
+        return cls(list(ids), ids, offsets, targets)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def outputs(self, node: int) -> array:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+
+def parse_input(file_name: str) -> DeviceGraph:
     with open(file_name, "r", encoding="ascii") as data_file:
         lines = data_file.read().splitlines()
     devices = {"out": []}
     for line in lines:
         name, attached = line.split(":")
         devices[name] = attached.strip().split(" ")
-    return devices
-
-
-def count_paths_through_waypoints(graph: dict, waypoints: list) -> int:
+    return DeviceGraph.from_devices(devices)
+
+
+def topological_order(
+    graph: DeviceGraph, roots: Iterable[int] | None = None
+) -> list[int]:
+    """Order the nodes reachable from roots (default: all nodes) so that
+    every edge goes forward, with an iterative depth-first search.
+    Raises ValueError if a cycle is reachable."""
+    offsets, targets = graph.offsets, graph.targets
+    state = bytearray(len(graph))  # 0 new, 1 on the stack, 2 done
+    post_order = []
+    for root in range(len(graph)) if roots is None else roots:
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, offsets[root])]
+        while stack:
+            node, edge = stack[-1]
+            if edge == offsets[node + 1]:
+                stack.pop()
+                state[node] = 2
+                post_order.append(node)
+                continue
+            stack[-1] = (node, edge + 1)
+            target = targets[edge]
+            if state[target] == 1:
+                cycle = [graph.names[n] for n, _ in stack]
+                cycle = cycle[cycle.index(graph.names[target]) :]
+                raise ValueError(f"Device graph has a cycle: {' -> '.join(cycle)}")
+            if not state[target]:
+                state[target] = 1
+                stack.append((target, offsets[target]))
+    post_order.reverse()
+    return post_order
+
+
+def count_paths_through_waypoints(graph: DeviceGraph, waypoints: list[str]) -> int:
     """Count all paths from source to dest passing through intermediate waypoints in order."""
     if len(waypoints) < 2:
         return 0
 
-    source = waypoints[0]
-    dest = waypoints[-1]
-
-    @cache
-    def dfs(current: str, waypoint_idx: int) -> int:
-        # Base case: reached destination after all waypoints
-        if waypoint_idx == len(waypoints) - 1:
-            return 1 if current == dest else 0
-
-        count = 0
-        next_waypoint = waypoints[waypoint_idx + 1]
-
-        # Explore neighbors
-        for neighbor in graph[current]:
-            # Advance waypoint_idx if we reach the next waypoint
-            next_idx = waypoint_idx + 1 if neighbor == next_waypoint else waypoint_idx
-            count += dfs(neighbor, next_idx)
-
-        return count
-
-    return dfs(source, 0)
-
-
-def day11_part1(devices: dict[str, list[str]]) -> int:
+    stops = [graph.ids[waypoint] for waypoint in waypoints]
+    last_stage = len(stops) - 1
+    offsets, targets = graph.offsets, graph.targets
+
+    # counts[stage][node] is the number of paths from the source to node
+    # that have passed the first `stage` waypoints after the source
+    counts = [[0] * len(graph) for _ in stops]
+    counts[0][stops[0]] = 1
+    for node in topological_order(graph, [stops[0]]):
+        for stage in range(last_stage):
+            count = counts[stage][node]
+            if not count:
+                continue
+            next_stop = stops[stage + 1]
+            for target in targets[offsets[node] : offsets[node + 1]]:
+                # Advance the stage if we reach the next waypoint
+                counts[stage + (target == next_stop)][target] += count
+
+    return counts[last_stage][stops[-1]]
+
+
+class PathCounter:
+    """Answers many path-count queries on one acyclic graph.
+    The topological order is computed once. The number of paths from a
+    source to every node is computed once per source and kept in an LRU
+    of at most max_sources vectors. Raises ValueError if the graph has a
+    cycle.
+    """
+
+    def __init__(self, graph: DeviceGraph, max_sources: int = 64):
+        self.graph = graph
+        self.order = topological_order(graph)
+        self.position = array("i", [0]) * len(graph)
+        for pos, node in enumerate(self.order):
+            self.position[node] = pos
+        self.max_sources = max_sources
+        self.vectors: OrderedDict[int, list[int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def paths_from(self, source: int) -> list[int]:
+        """Number of paths from source to every node, by node id."""
+        if source in self.vectors:
+            self.hits += 1
+            self.vectors.move_to_end(source)
+            return self.vectors[source]
+        self.misses += 1
+
+        offsets, targets = self.graph.offsets, self.graph.targets
+        counts = [0] * len(self.graph)
+        counts[source] = 1
+        # Only nodes after the source in topological order can be reached
+        for node in self.order[self.position[source] :]:
+            count = counts[node]
+            if count:
+                for target in targets[offsets[node] : offsets[node + 1]]:
+                    counts[target] += count
+
+        self.vectors[source] = counts
+        if len(self.vectors) > self.max_sources:
+            self.vectors.popitem(last=False)
+        return counts
+
+    def count(self, source: str, dest: str) -> int:
+        """Number of paths from source to dest, 1 for the empty path if equal."""
+        ids = self.graph.ids
+        return self.paths_from(ids[source])[ids[dest]]
+
+    def count_through(self, waypoints: list[str]) -> int:
+        """Count paths visiting the waypoints in order, as in
+        count_paths_through_waypoints. In a DAG a path cannot revisit a node,
+        so with distinct waypoints this is the product of the segment counts."""
+        if len(waypoints) < 2:
+            return 0
+        if len(set(waypoints)) < len(waypoints):
+            return count_paths_through_waypoints(self.graph, waypoints)
+        total = 1
+        for source, dest in zip(waypoints, waypoints[1:]):
+            total *= self.count(source, dest)
+            if not total:
+                break
+        return total
+
+
+def day11_part1(devices: DeviceGraph) -> int:
     return count_paths_through_waypoints(devices, ["you", "out"])
 
 
-def day11_part2(devices: dict[str, list[str]]) -> int:
+def day11_part2(devices: DeviceGraph) -> int:
     return count_paths_through_waypoints(devices, ["svr", "fft", "dac", "out"])
 
 
@@ -62,6 +195,37 @@ def test_day11_part2():
     assert day11_part2(test_data) == 2
 
 
+def test_deep_graph_and_cycles():
+    # A ladder of 10000 rungs has 2**10000 paths and no recursion limit
+    devices = {f"n{i}": [f"a{i}", f"b{i}"] for i in range(10_000)}
+    devices |= {f"a{i}": [f"n{i + 1}"] for i in range(10_000)}
+    devices |= {f"b{i}": [f"n{i + 1}"] for i in range(10_000)}
+    devices["n10000"] = []
+    graph = DeviceGraph.from_devices(devices)
+    assert count_paths_through_waypoints(graph, ["n0", "n10000"]) == 2**10_000
+
+    graph = DeviceGraph.from_devices({"you": ["a"], "a": ["b"], "b": ["a", "out"]})
+    with pytest.raises(ValueError, match="a -> b"):
+        day11_part1(graph)
+
+
+def test_path_counter():
+    test_data = parse_input("data/day11_test_part2.txt")
+    counter = PathCounter(test_data, max_sources=4)
+    assert counter.count_through(["svr", "fft", "dac", "out"]) == 2
+    assert counter.count("svr", "out") == 8
+    names = test_data.names
+    for source in names:
+        for dest in names:
+            expected = count_paths_through_waypoints(test_data, [source, dest])
+            assert counter.count(source, dest) == (expected or int(source == dest))
+            assert counter.count_through([source, "ccc", dest]) == (
+                count_paths_through_waypoints(test_data, [source, "ccc", dest])
+            )
+    assert len(counter.vectors) == 4
+    assert counter.hits > counter.misses
+
+
 if __name__ == "__main__":
     input_data = parse_input("data/day11.txt")
 
@@ -3,7 +3,42 @@ Advent of Code 2025
 Day 12: Christmas Tree Farm
 """
 
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
+from functools import cache
+
+import pytest
+
+Position = tuple[int, int]
+
+
+@dataclass(frozen=True)
+class Shape:
+    cells: frozenset[Position]  # (x, y) of every # in the drawing
+
+    @property
+    def size(self) -> int:
+        return len(self.cells)
+
+    @property
+    def extent(self) -> int:
+        """Side of the smallest square holding the shape in any orientation."""
+        return max(max(x for x, _ in self.cells), max(y for _, y in self.cells)) + 1
+
+    def orientations(self) -> list[tuple[Position, ...]]:
+        """Distinct rotations and reflections, each as its cells sorted in
+        row-major order and shifted so that the first one is (0, 0)."""
+        found = set()
+        cells = list(self.cells)
+        for _ in range(4):
+            cells = [(y, -x) for x, y in cells]  # rotate
+            for variant in (cells, [(-x, y) for x, y in cells]):  # reflect
+                ordered = sorted(variant, key=lambda cell: (cell[1], cell[0]))
+                first_x, first_y = ordered[0]
+                found.add(tuple((x - first_x, y - first_y) for x, y in ordered))
+        return sorted(found)
 
 
 @dataclass
@@ -17,28 +52,300 @@ class Region:
         return self.width * self.height
 
 
-def parse_input(file_name: str) -> list[Region]:
+@dataclass
+class FitResult:
+    fits: bool | None  # None if the time budget ran out
+    decided_by: str  # "bound" or "search"
+    nodes: int = 0  # search nodes visited
+    elapsed: float = 0.0
+
+
+def parse_input(file_name: str) -> tuple[list[Shape], list[Region]]:
     with open(file_name, "r", encoding="ascii") as data_file:
-        lines = data_file.read().splitlines()
+        blocks = data_file.read().split("\n\n")
+    shapes = []
     regions = []
-    for line in lines:
-        if "x" not in line:
+    for block in blocks:
+        lines = block.splitlines()
+        if not lines:
+            continue
+        if "x" not in lines[0]:
+            shapes.append(
+                Shape(
+                    frozenset(
+                        (x, y)
+                        for y, row in enumerate(lines[1:])
+                        for x, cell in enumerate(row)
+                        if cell == "#"
+                    )
+                )
+            )
+            continue
+        for line in lines:
+            line = line.replace("x", " ").replace(":", " ")
+            numbers = [int(x) for x in line.split()]
+            regions.append(Region(numbers[0], numbers[1], numbers[2:]))
+    return shapes, regions
+
+
+@cache
+def placement_table(
+    orientations: tuple[tuple[tuple[Position, ...], ...], ...], width: int, height: int
+) -> list[list[tuple[int, int]]]:
+    """For every cell of a width x height board, the (piece, bitmask) of each
+    placement whose first cell in row-major order is that cell.
+    Bit y * width + x stands for cell (x, y)."""
+    table: list[list[tuple[int, int]]] = [[] for _ in range(width * height)]
+    for piece, piece_orientations in enumerate(orientations):
+        for cells in piece_orientations:
+            for y in range(height):
+                for x in range(width):
+                    if all(
+                        0 <= x + dx < width and 0 <= y + dy < height for dx, dy in cells
+                    ):
+                        mask = sum(1 << ((y + dy) * width + x + dx) for dx, dy in cells)
+                        table[y * width + x].append((piece, mask))
+    return table
+
+
+Move = tuple[int, int, int]  # (piece or -1 for a hole, bitmask, holes left)
+
+
+@dataclass
+class Frame:
+    """One level of the packing search."""
+
+    board: int
+    moves: Iterator[Move]
+    placed: int = -1  # piece placed by the current move, -1 if none
+
+
+def pack(
+    orientations: tuple[tuple[tuple[Position, ...], ...], ...],
+    counts: list[int],
+    sizes: list[int],
+    width: int,
+    height: int,
+    deadline: float | None = None,
+) -> tuple[bool | None, int]:
+    """Bitboard backtracking: the first empty cell is either covered by a
+    placement starting there or left as a hole, while holes remain.
+    Returns (fits or None on timeout, nodes visited)."""
+    table = placement_table(orientations, width, height)
+    counts = list(counts)
+    pieces_left = sum(counts)
+    if not pieces_left:
+        return True, 0
+    holes = width * height - sum(c * s for c, s in zip(counts, sizes))
+    nodes = 0
+
+    def moves(board: int, holes: int) -> Iterator[Move]:
+        cell = (~board & (board + 1)).bit_length() - 1
+        for piece, mask in table[cell]:
+            if counts[piece] and not board & mask:
+                yield piece, mask, holes
+        if holes:
+            yield -1, 1 << cell, holes - 1
+
+    # Every cell before the first empty one is settled, so a state is the
+    # board from that cell on plus the pieces left. Failed states are kept.
+    failed: set[tuple[int, int, tuple[int, ...]]] = set()
+
+    def state(board: int) -> tuple[int, int, tuple[int, ...]]:
+        cell = (~board & (board + 1)).bit_length() - 1
+        return board >> cell, cell, tuple(counts)
+
+    stack = [Frame(0, moves(0, holes))]
+    while stack:
+        frame = stack[-1]
+        if frame.placed >= 0:
+            counts[frame.placed] += 1
+            pieces_left += 1
+            frame.placed = -1
+        move = next(frame.moves, None)
+        if move is None:
+            failed.add(state(frame.board))
+            stack.pop()
             continue
-        line = line.replace("x", " ").replace(":", " ")
-        numbers = [int(x) for x in line.split()]
-        regions.append(Region(numbers[0], numbers[1], numbers[2:]))
-    return regions
+        nodes += 1
+        if deadline is not None and not nodes % 4096 and time.perf_counter() > deadline:
+            return None, nodes
+        piece, mask, new_holes = move
+        if piece >= 0:
+            counts[piece] -= 1
+            pieces_left -= 1
+            frame.placed = piece
+            if not pieces_left:
+                return True, nodes
+        board = frame.board | mask
+        if state(board) in failed:
+            continue
+        stack.append(Frame(board, moves(board, new_holes)))
+    return False, nodes
+
+
+def bound_fit(shapes: list[Shape], region: Region) -> bool | None:
+    """Decide the region without searching when possible: it cannot fit if
+    it has fewer cells than the presents, and fits if it has a free square
+    block for every present. None if neither bound applies."""
+    needed = sum(c * shape.size for c, shape in zip(region.shape_counters, shapes))
+    if needed > region.size:
+        return False
+    block = max(shape.extent for shape in shapes)
+    blocks = (region.width // block) * (region.height // block)
+    if blocks >= sum(region.shape_counters):
+        return True
+    return None
+
+
+def fit_region(
+    shapes: list[Shape], region: Region, time_budget: float | None = None
+) -> FitResult:
+    """Decide whether the region's presents fit, by the bound if possible,
+    otherwise by a search of at most time_budget seconds."""
+    start = time.perf_counter()
+    fits = bound_fit(shapes, region)
+    if fits is not None:
+        return FitResult(fits, "bound")
+
+    # Symmetry breaking: shapes that are the same up to rotation and
+    # reflection are merged, and copies of a shape are interchangeable
+    merged: dict[tuple[tuple[Position, ...], ...], list[int]] = {}
+    for count, shape in zip(region.shape_counters, shapes):
+        if count:
+            piece = merged.setdefault(tuple(shape.orientations()), [0, shape.size])
+            piece[0] += count
+    deadline = None if time_budget is None else start + time_budget
+    # Scanning along the shorter side keeps the frontier of the search small
+    fits, nodes = pack(
+        tuple(merged),
+        [count for count, _ in merged.values()],
+        [size for _, size in merged.values()],
+        min(region.width, region.height),
+        max(region.width, region.height),
+        deadline,
+    )
+    return FitResult(fits, "search", nodes, time.perf_counter() - start)
+
+
+@dataclass
+class FarmReport:
+    """Outcome of checking every region."""
+
+    fitting: int
+    decided_by_bound: int
+    decided_by_search: int
+    undecided: list[int]  # indices of the regions whose search timed out
+
+
+def _fit_task(args: tuple[list[Shape], Region, float | None]) -> FitResult:
+    return fit_region(*args)
+
+
+def fit_regions(
+    shapes: list[Shape],
+    regions: list[Region],
+    workers: int = 1,
+    time_budget: float | None = None,
+) -> Iterator[tuple[int, FitResult]]:
+    """Yield (region index, result) as regions are decided. Regions settled
+    by the bound come first; the others are searched, largest first, on a
+    process pool when workers > 1, and stream back as they finish."""
+    searched = []
+    for i, region in enumerate(regions):
+        fits = bound_fit(shapes, region)
+        if fits is None:
+            searched.append(i)
+        else:
+            yield i, FitResult(fits, "bound")
+
+    # The largest regions with the most presents have the longest searches
+    searched.sort(
+        key=lambda i: (regions[i].size, sum(regions[i].shape_counters)), reverse=True
+    )
+    if workers == 1:
+        for i in searched:
+            yield i, fit_region(shapes, regions[i], time_budget)
+        return
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {
+            pool.submit(_fit_task, (shapes, regions[i], time_budget)): i
+            for i in searched
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def check_regions(
+    shapes: list[Shape],
+    regions: list[Region],
+    workers: int = 1,
+    time_budget: float | None = None,
+) -> FarmReport:
+    report = FarmReport(0, 0, 0, [])
+    for i, result in fit_regions(shapes, regions, workers, time_budget):
+        report.fitting += result.fits is True
+        if result.fits is None:
+            report.undecided.append(i)
+        elif result.decided_by == "bound":
+            report.decided_by_bound += 1
+        else:
+            report.decided_by_search += 1
+    report.undecided.sort()
+    return report
+
+
+def day12_part1(
+    shapes: list[Shape],
+    regions: list[Region],
+    workers: int = 1,
+    time_budget: float | None = None,
+) -> int:
+    return check_regions(shapes, regions, workers, time_budget).fitting
+
+
+@pytest.fixture(autouse=True, name="test_data")
+def fixture_test_data():
+    return parse_input("data/day12_test.txt")
+
+
+def test_day12_part1(test_data):
+    assert day12_part1(*test_data) == 2
+
+
+def test_parse_input_trailing_blank_line(tmp_path):
+    path = tmp_path / "day12.txt"
+    with open("data/day12_test.txt", "r", encoding="ascii") as data_file:
+        path.write_text(data_file.read().rstrip("\n") + "\n\n")
+    shapes, regions = parse_input(str(path))
+    assert (len(shapes), len(regions)) == (6, 3)
+
+
+def test_fit_region(test_data):
+    shapes, regions = test_data
+    assert [len(shape.orientations()) for shape in shapes] == [8, 8, 2, 4, 4, 2]
+    results = [fit_region(shapes, region) for region in regions]
+    assert [result.fits for result in results] == [True, True, False]
+    assert all(result.decided_by == "search" for result in results)
+    assert fit_region(shapes, Region(3, 3, [0, 0, 0, 0, 0, 2])).decided_by == "bound"
+    assert fit_region(shapes, Region(9, 3, [1, 1, 1])) == FitResult(True, "bound")
+
+    assert fit_region(shapes, Region(60, 60, [80] * 6), time_budget=0.05).fits is None
 
 
-def day12_part1(regions: list[Region]) -> int:
-    # Surprisingly, the puzzle input is not as hard as the example.
-    return sum(region.size >= 9 * sum(region.shape_counters) for region in regions)
+def test_check_regions_parallel(test_data):
+    shapes, regions = test_data
+    regions = [*regions, Region(9, 3, [1, 1, 1]), Region(60, 60, [80] * 6)]
+    report = check_regions(shapes, regions, workers=2, time_budget=0.5)
+    assert report == FarmReport(3, 1, 3, [4])
+    order = [i for i, _ in fit_regions(shapes, regions[:4])]
+    assert order == [3, 2, 1, 0]
 
 
 if __name__ == "__main__":
     input_data = parse_input("data/day12.txt")
 
     print("Day 12 Part 1:")
-    print(day12_part1(input_data))
+    print(day12_part1(*input_data))
 
     # There is no part 2 to be solved on this day :-)